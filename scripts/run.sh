@@ -21,8 +21,9 @@ Run Project in specified environment
      -h             Display this help
 
     ARGS
-     1. Action          human | neural show | neural train | ham
-     2. UI              cli | gui | cui
+     1. Action          human | neural show | neural train | ham | bench
+     2. UI              cli | gui | cui | headless
+     3. Extras          warm | decoupled
 
 Configure $0 defaults using .env file
 
@@ -39,12 +40,18 @@ Configure $0 defaults using .env file
             - CUI=False                     [0 | 1]
             - GUI=False                     [0 | 1]
             - CLI=False                     [0 | 1]
+            - HEADLESS=False                [0 | 1]
 
         Default Player
             - HAM=False                     [0 | 1]
             - HUMAN=False                   [0 | 1]
             - NEURAL=False                  [0 | 1]
 
+        Default Extras
+            - BENCH=False                   [0 | 1]
+            - HAMCYCLE_WARM=False           [0 | 1]
+            - DECOUPLED_RENDER=False        [0 | 1]
+
         Default Reinforcement  Learning
             - SHOW_TRAINING_GRAPHS=True     [0 | 1]
             - TRAIN_AGENT=False             [0 | 1]
@@ -0,0 +1,202 @@
+"""
+Headless throughput benchmarks, run with `python main.py bench`.
+
+Every (player, board size) case runs in a fresh process so its peak memory is its own.
+A case plays BENCH_GAMES seeded games with the headless user interface and records:
+    setup_s:    mean player construction, i.e. the Hamiltonian cycle build for ham players
+    steps/s:    moves per second of play
+    games/s:    games per second of play
+    p50/p99:    latency of a single decision (get_input), in microseconds
+    peak_rss:   peak resident memory of the process, in MiB
+
+A game ends when the board is full, the snake dies, it goes 2 * cells moves without
+eating or BENCH_MAX_STEPS is reached. The "engine" case steps a SnakeGameBatch with
+random moves instead, its latency being one step of all boards.
+"""
+
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from config import settings
+from lib.utilities import logger
+from players.base import PlayerBase
+
+Result = Dict[str, Any]
+
+HAM_PLAYERS = ["smart", "complete", "naive"]
+
+
+def parse_sizes(sizes: str) -> List[Tuple[int, int]]:
+    """Parses sizes written as WIDTHxHEIGHT, e.g. 6x4,16x12"""
+    return [tuple(map(int, size.split("x"))) for size in sizes.split(",") if size]
+
+
+def make_player(name: str, width: int, height: int) -> PlayerBase:
+    """Builds the headless version of a player"""
+    if name in HAM_PLAYERS:
+        from players import hamiltonian
+
+        # Always build the cycle so setup_s measures the construction
+        settings.HamCycle.CACHE = False
+        return getattr(hamiltonian, name).PlayerNull(width, height)
+
+    if name == "neural":
+        from players.neural import AgentNull
+        from players.neural.inference import get_policy
+
+        player = AgentNull(width, height, settings.Models.FILEPATH)
+        player.policy = get_policy(player.model, settings.Agent.INFERENCE)
+        return player
+
+    raise ValueError(f"Unknown benchmark player: {name}")
+
+
+def play(name: str, width: int, height: int, games: int, max_steps: int) -> Result:
+    cells = width * height
+    setups, latencies, scores, wins, steps, elapsed = [], [], [], 0, 0, 0.0
+
+    for seed in range(games):
+        # Players keep per-game state (cycle position, tracked body) so each game gets one
+        start = time.perf_counter()
+        player = make_player(name, width, height)
+        setups.append(time.perf_counter() - start)
+
+        player.seed = seed
+        game = player.create_game()
+        game.new_game()
+        stalled = 0
+
+        start = time.perf_counter()
+        for _ in range(max_steps):
+            tick = time.perf_counter_ns()
+            direction = player.get_input(game)
+            latencies.append(time.perf_counter_ns() - tick)
+
+            score = game.score
+            alive = game.move(direction)
+            steps += 1
+            stalled = 0 if game.score > score else stalled + 1
+            if not alive or game.completed or stalled > 2 * cells:
+                break
+        elapsed += time.perf_counter() - start
+
+        scores.append(game.score)
+        wins += game.completed
+
+    setup = float(np.mean(setups))
+    return summarize(setup, elapsed, steps, games, latencies) | {
+        "wins": wins,
+        "mean_score": float(np.mean(scores)),
+    }
+
+
+def engine(width: int, height: int, boards: int, max_steps: int) -> Result:
+    from game import SnakeGameBatch
+
+    start = time.perf_counter()
+    batch = SnakeGameBatch(boards, width, height, seed=0)
+    rng = np.random.default_rng(0)
+    setup = time.perf_counter() - start
+
+    games, latencies = 0, []
+    steps = max(min(max_steps // boards, 10_000), 1)
+    start = time.perf_counter()
+    for _ in range(steps):
+        actions = rng.integers(0, 5, boards)
+        tick = time.perf_counter_ns()
+        _, done, _ = batch.step(actions)
+        batch.reset(done)
+        latencies.append(time.perf_counter_ns() - tick)
+        games += int(done.sum())
+    elapsed = time.perf_counter() - start
+
+    return summarize(setup, elapsed, steps * boards, games, latencies) | {
+        "boards": boards
+    }
+
+
+def summarize(
+    setup: float, elapsed: float, steps: int, games: int, latencies: List[int]
+) -> Result:
+    p50, p99 = np.percentile(latencies, [50, 99]) / 1000 if latencies else (0, 0)
+    return {
+        "setup_s": round(setup, 6),
+        "elapsed_s": round(elapsed, 6),
+        "steps": steps,
+        "games": games,
+        "steps_per_s": round(steps / elapsed, 1) if elapsed else 0,
+        "games_per_s": round(games / elapsed, 3) if elapsed else 0,
+        "p50_us": round(float(p50), 3),
+        "p99_us": round(float(p99), 3),
+    }
+
+
+def run_case(name: str, width: int, height: int) -> Result:
+    """Process pool entry point, benchmarks one player on one board size"""
+    bench = settings.Bench
+    if name == "engine":
+        result = engine(width, height, bench.ENGINE_BOARDS, bench.MAX_STEPS)
+    else:
+        result = play(name, width, height, bench.GAMES, bench.MAX_STEPS)
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak /= 1024 * 1024 if sys.platform == "darwin" else 1024
+    return (
+        {"player": name, "width": width, "height": height}
+        | result
+        | {"peak_rss_mib": round(peak, 1)}
+    )
+
+
+def run() -> List[Result]:
+    bench = settings.Bench
+    context = multiprocessing.get_context("spawn")
+
+    results = []
+    for name in filter(None, bench.PLAYERS.split(",")):
+        for width, height in parse_sizes(bench.SIZES):
+            if name == "naive" and width * height > bench.NAIVE_MAX_CELLS:
+                logger.info(
+                    "Skipping naive on %ix%i (exponential search)", width, height
+                )
+                continue
+
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(run_case, name, width, height).result()
+            results.append(result)
+            logger.info(
+                "%-8s %3ix%-3i %12.1f steps/s %9.3f games/s "
+                "p50 %8.2fus p99 %8.2fus setup %8.4fs peak %7.1fMiB",
+                name,
+                width,
+                height,
+                result["steps_per_s"],
+                result["games_per_s"],
+                result["p50_us"],
+                result["p99_us"],
+                result["setup_s"],
+                result["peak_rss_mib"],
+            )
+
+    output = Path(bench.OUTPUT)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    logger.info("Benchmark results written to %s", output)
+    return results
@@ -1,8 +1,9 @@
-from . import game, hamiltonian, neural, ui
+from . import bench, game, hamiltonian, neural, ui
 
 
 class Core:
     Dimension = game.Dimension()
+    Game = game.Game()
     Player = game.Player()
     UI = game.UI()
 
@@ -17,5 +18,7 @@ class Core:
     Models = neural.Models()
     Agent = neural.Agent()
 
+    Bench = bench.Bench()
+
 
 settings = Core()
@@ -0,0 +1,12 @@
+from lib.utilities import load_bool, load_variable
+
+
+class Bench:
+    RUN: bool = load_bool("BENCH") or load_bool("bench")
+    PLAYERS: str = load_variable("BENCH_PLAYERS", "smart,complete,naive,neural,engine")
+    SIZES: str = load_variable("BENCH_SIZES", "6x4,16x12,32x24")
+    GAMES: int = int(load_variable("BENCH_GAMES", 3))
+    MAX_STEPS: int = int(load_variable("BENCH_MAX_STEPS", 1_000_000))
+    NAIVE_MAX_CELLS: int = int(load_variable("BENCH_NAIVE_MAX_CELLS", 36))
+    ENGINE_BOARDS: int = int(load_variable("BENCH_ENGINE_BOARDS", 256))
+    OUTPUT: str = load_variable("BENCH_OUTPUT", "logs/bench.json")
@@ -6,6 +6,12 @@ class Dimension:
     WIDTH = int(load_variable("WIDTH", 32))
 
 
+class Game:
+    # Seeds food placement so a game can be replayed, random when unset
+    SEED = load_variable("GAME_SEED")
+    SEED = int(SEED) if SEED else None
+
+
 class Player:
     HAM: bool = load_bool("HAM") or load_bool("ham")
     HUMAN: bool = load_bool("HUMAN") or load_bool("human")
@@ -16,3 +22,4 @@ class UI:
     GUI: bool = load_bool("GUI") or load_bool("gui")
     CUI: bool = load_bool("CUI") or load_bool("cui")
     CLI: bool = load_bool("CLI") or load_bool("cli")
+    HEADLESS: bool = load_bool("HEADLESS") or load_bool("headless")
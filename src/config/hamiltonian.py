@@ -5,3 +5,13 @@ class HamCycle:
     SUBSECTION_SIZE: int = int(load_variable("HAMCYCLE_SUBSECTION_SIZE", 20))
     SHUFFLE: bool = load_bool("HAMCYCLE_SHUFFLE", True)
     RISK: int = int(load_variable("HAMCYCLE_RISK", 5))
+    VALIDATE: bool = load_bool("HAMCYCLE_VALIDATE")
+
+    SEED = load_variable("HAMCYCLE_SEED")
+    SEED = int(SEED) if SEED else None
+    CACHE: bool = load_bool("HAMCYCLE_CACHE", True)
+    WORKERS: int = int(load_variable("HAMCYCLE_WORKERS", 1))
+
+    WARM: bool = load_bool("HAMCYCLE_WARM") or load_bool("warm")
+    WARM_MIN: int = int(load_variable("HAMCYCLE_WARM_MIN", 4))
+    WARM_MAX: int = int(load_variable("HAMCYCLE_WARM_MAX", 64))
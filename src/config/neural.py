@@ -13,6 +13,7 @@ class States:
 
 class Agent:
     DEMO = load_bool("AGENT_DEMO") or load_bool("demo")
+    INFERENCE = load_variable("AGENT_INFERENCE", "numpy")
     ACTIONS = 3
     STATES = 11
 
@@ -24,10 +25,19 @@ class Models:
     BATCH_SIZE = int(load_variable("MODEL_BATCH_SIZE", 1000))
     LR = float(load_variable("MODEL_LR", 0.001))
 
+    PRIORITIZED = load_bool("MODEL_PRIORITIZED")
+    PRIORITY_ALPHA = float(load_variable("MODEL_PRIORITY_ALPHA", 0.6))
+    PRIORITY_BETA = float(load_variable("MODEL_PRIORITY_BETA", 0.4))
+
     FILEPATH: str = load_variable("MODEL_FILEPATH")
+    MEMORY_FILEPATH: str = load_variable("MODEL_MEMORY_FILEPATH")
 
 
 class Trainer:
     TARGET_SCORE = int(load_variable("TRAIN_TARGET_SCORE", 100))
     TRAIN_AGENT = load_bool("TRAIN_AGENT") or load_bool("train")
     SHOW_GRAPHS = load_bool("SHOW_TRAINING_GRAPHS", True)
+    GRAPH_INTERVAL = float(load_variable("TRAIN_GRAPH_INTERVAL", 1))
+    METRICS_FILEPATH: str = load_variable("TRAIN_METRICS_FILEPATH")
+    ENVS = int(load_variable("TRAIN_ENVS", 1))
+    WORKERS = int(load_variable("TRAIN_WORKERS", 0))
@@ -1,4 +1,4 @@
-from lib.utilities import load_variable
+from lib.utilities import load_bool, load_variable
 
 
 class Color:
@@ -11,3 +11,7 @@ class Display:
     FRAMERATE = int(load_variable("FRAMERATE_GUI", 30))
     BLOCK = int(load_variable("BLOCK_SIZE_GUI", 20))
     DELAY = float(load_variable("DELAY_CLI", 0.1))
+
+    DECOUPLED: bool = load_bool("DECOUPLED_RENDER") or load_bool("decoupled")
+    RENDER_FPS = int(load_variable("RENDER_FPS", 30))
+    SIMULATION_SPEED = float(load_variable("SIMULATION_SPEED", 0))
@@ -1,4 +1,20 @@
-from .base import Direction, Point, SnakeGame
-from .cli import SnakeGameCLI
-from .cui import SnakeGameCUI
-from .gui import SnakeGameGUI
+import importlib
+from typing import Any
+
+from .base import QUIT, Direction, Point, SnakeGame
+from .null import SnakeGameNull
+
+# User interfaces and the NumPy batch engine are imported on first use so a run only
+# loads its own backend
+INTERFACES = {
+    "SnakeGameBatch": ".batch",
+    "SnakeGameCLI": ".cli",
+    "SnakeGameCUI": ".cui",
+    "SnakeGameGUI": ".gui",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in INTERFACES:
+        return getattr(importlib.import_module(INTERFACES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,10 @@
+import queue
 import random
 import sys
 from abc import abstractmethod
 from collections import deque
 from enum import Enum
-from typing import Optional
-
-import keyboard
+from typing import Any, Optional, Set, Tuple
 
 from lib.dsa import Point
 from lib.utilities import logger
@@ -18,15 +17,31 @@ class Direction(Enum):
     LEFT = 4
 
 
+# Input event asking to exit, every other event is a Direction
+QUIT = "quit"
+
+
 class SnakeGame:
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(self, width: int, height: int, seed: Optional[int] = None) -> None:
         self.width = width
         self.height = height
         self.max_score = (width * height) - 3
         self.direction = Direction.RIGHT
+        self.random = random.Random(seed)
+        # Cleared when another thread polls input, see PlayerBase.play_decoupled
+        self.poll_input = True
+
+        # Input readers push events here, read_input sorts them out for the game
+        self.events: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self.directions: deque = deque(maxlen=16)
+        self.input_started = False
+        self.kill_switch = None
 
     def new_game(self) -> None:
         self.score = 0
+        self.completed = False
+        self.drawn: Set[Point] = set()
+        self.drawn_food = None
         self.food = None
         self.direction = self.direction
         self.head = Point(self.width // 2, self.height // 2)
@@ -38,9 +53,25 @@ class SnakeGame:
             ]
         )
 
+        # Occupancy counts per cell and a swap-remove index of the empty ones
+        cells = self.width * self.height
+        self.grid = bytearray(cells)
+        self.free = list(range(cells))
+        self.free_pos = list(range(cells))
+        for pt in self.snake:
+            self.occupy(pt)
+
         self.place_food()
 
     def game_completed(self) -> None:
+        self.completed = True
+        # Off the game thread the board is only marked as completed, the prompt and exit
+        # are left to the drawing thread, see PlayerBase.play_decoupled
+        if not self.poll_input:
+            return
+
+        # The input reader would otherwise take the <ENTER> meant for the prompt
+        self.stop_input()
         input("Press the <ENTER> key to continue...")
 
         self.exit()
@@ -49,22 +80,44 @@ class SnakeGame:
         if self.score == self.max_score:
             self.game_completed()
 
-        while not self.food or self.food in self.snake:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            self.food = Point(x, y)
+        if self.free and (not self.food or self.is_occupied(self.food)):
+            cell = self.free[self.random.randrange(len(self.free))]
+            self.food = Point(cell % self.width, cell // self.width)
+
+    def occupy(self, pt: Point) -> None:
+        cell = pt.y * self.width + pt.x
+        self.grid[cell] += 1
+        if self.grid[cell] == 1:
+            last = self.free.pop()
+            if last != cell:
+                pos = self.free_pos[cell]
+                self.free[pos] = last
+                self.free_pos[last] = pos
+
+    def vacate(self, pt: Point) -> None:
+        cell = pt.y * self.width + pt.x
+        self.grid[cell] -= 1
+        if not self.grid[cell]:
+            self.free_pos[cell] = len(self.free)
+            self.free.append(cell)
+
+    def in_bounds(self, pt: Point) -> bool:
+        return 0 <= pt.x < self.width and 0 <= pt.y < self.height
+
+    def is_occupied(self, pt: Point) -> bool:
+        """Constant time equivalent of `pt in self.snake`"""
+        return self.in_bounds(pt) and self.grid[pt.y * self.width + pt.x] > 0
 
     def is_collision(self, pt: Optional[Point] = None) -> bool:
         if not pt:
             pt = self.head
-        body = self.snake.copy()
-        body.popleft()
-        if pt in body:
-            logger.debug("Snake ate itself...")
-            return True
-        if not 0 <= pt.x < self.width or not 0 <= pt.y < self.height:
+        if not self.in_bounds(pt):
             logger.debug("Boundary was hit...")
             return True
+        # The head itself is not part of the body it can collide with
+        if self.grid[pt.y * self.width + pt.x] > (pt == self.snake[0]):
+            logger.debug("Snake ate itself...")
+            return True
         return False
 
     def move(self, direction: Optional[Direction]) -> bool:
@@ -75,7 +128,8 @@ class SnakeGame:
         return True
 
     def move_head(self, direction: Optional[Direction] = None) -> None:
-        self.handle_kill_switch()
+        if self.poll_input:
+            self.handle_kill_switch()
         x, y = self.head.x, self.head.y
 
         if direction:
@@ -91,7 +145,7 @@ class SnakeGame:
                 self.head = Point(x - 1, y)
 
         if self.head != self.snake[1]:
-            self.snake.appendleft(self.head)
+            self.append_head()
             return
 
         # Keep going straight if head is eating neck
@@ -105,23 +159,89 @@ class SnakeGame:
             case Direction.LEFT:
                 self.head = Point(x + 1, y)
 
+        self.append_head()
+
+    def append_head(self) -> None:
         self.snake.appendleft(self.head)
+        if self.in_bounds(self.head):
+            self.occupy(self.head)
 
     def update_tail(self) -> bool:
         if self.head == self.food:
             self.score += 1
             self.place_food()
             return True
-        self.snake.pop()
+        self.vacate(self.snake.pop())
         return False
 
+    def frame_changes(self) -> Tuple[Set[Point], Set[Point]]:
+        """
+        Snake cells to draw and cells to clear since the previous call, however many moves
+        happened in between, so a renderer can sample a game that moves faster than it draws.
+        """
+        body = {pt for pt in self.snake if self.in_bounds(pt)}
+        added, removed = body - self.drawn, self.drawn - body
+        if self.drawn_food and self.drawn_food != self.food:
+            removed.add(self.drawn_food)
+        self.drawn, self.drawn_food = body, self.food
+        return added, removed - body
+
     def exit(self) -> None:
+        self.stop_input()
         sys.exit()
 
-    def handle_kill_switch(self) -> None:
-        if keyboard.is_pressed("q"):
+    def start_input(self) -> None:
+        """Starts the input reader of the user interface"""
+        import keyboard
+
+        self.kill_switch = keyboard.on_press_key("q", lambda _: self.events.put(QUIT))
+
+    def stop_input(self) -> None:
+        """Stops the input reader started by start_input"""
+        if self.kill_switch is not None:
+            import keyboard
+
+            keyboard.unhook(self.kill_switch)
+            self.kill_switch = None
+        self.input_started = False
+
+    def pump_input(self, timeout: float = 0) -> None:
+        """
+        Queues the input of user interfaces that must be read on the game thread,
+        waiting up to timeout seconds for an event
+        """
+        if timeout:
+            try:
+                self.handle_event(self.events.get(timeout=timeout))
+            except queue.Empty:
+                pass
+
+    def read_input(self, timeout: float = 0) -> None:
+        if not self.input_started:
+            self.start_input()
+            self.input_started = True
+
+        self.pump_input(timeout)
+        while True:
+            try:
+                self.handle_event(self.events.get_nowait())
+            except queue.Empty:
+                return
+
+    def handle_event(self, event: Any) -> None:
+        if event == QUIT:
             logger.info("Kill switch utilized to exit program")
             self.exit()
+        self.directions.append(event)
+
+    def next_direction(self, timeout: float = 0) -> Optional[Direction]:
+        """Oldest key press not yet played, waiting up to timeout seconds for one"""
+        if not self.directions:
+            self.read_input(timeout)
+        return self.directions.popleft() if self.directions else None
+
+    def handle_kill_switch(self) -> None:
+        self.read_input()
 
     @abstractmethod
     def refresh():
@@ -129,3 +249,10 @@ class SnakeGame:
         Refresh user interface and show score
         """
         pass
+
+    @abstractmethod
+    def render_frame(self, changes: Tuple[Set[Point], Set[Point]]) -> None:
+        """
+        Draw the cells returned by frame_changes and show score
+        """
+        pass
@@ -0,0 +1,152 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .base import Direction
+
+# Offsets indexed by Direction.value (index 0 keeps the current direction)
+DX = np.array([0, 0, 1, 0, -1], dtype=np.int64)
+DY = np.array([0, -1, 0, 1, 0], dtype=np.int64)
+
+
+class SnakeGameBatch:
+    """
+    Headless engine that advances N boards at once.
+
+    Each board follows the rules of SnakeGame.move:
+        1. The head moves in the requested direction (0 keeps the current one)
+        2. Turning back onto the neck keeps the snake going straight
+        3. Hitting a wall or any body cell (including the tail) ends the game
+        4. Eating food grows the snake and places new food on a free cell
+
+    Boards are stored as arrays of flat cell indices (y * width + x):
+        grid:   (N, cells) occupancy of the snake bodies
+        body:   (N, cells) ring buffer of body cells, body[n, ptr[n]] is the head
+        length: (N,) snake lengths
+        food:   (N,) food cells
+    """
+
+    def __init__(
+        self,
+        n: int,
+        width: int,
+        height: int,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.n = n
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.max_score = self.cells - 3
+        self.rng = np.random.default_rng(seed)
+
+        self.boards = np.arange(n)
+        self.grid = np.zeros((n, self.cells), dtype=bool)
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+
+        self.head_x = np.zeros(n, dtype=np.int64)
+        self.head_y = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Starts a new game on every board selected by mask (all boards by default)"""
+        idx = self.boards if mask is None else np.flatnonzero(mask)
+        if not idx.size:
+            return
+
+        x, y = self.width // 2, self.height // 2
+        start = y * self.width + np.array([x - 2, x - 1, x])
+
+        self.grid[idx] = False
+        self.grid[idx[:, None], start] = True
+        self.body[idx, :3] = start
+        self.ptr[idx] = 2
+        self.length[idx] = 3
+
+        self.head_x[idx] = x
+        self.head_y[idx] = y
+        self.direction[idx] = Direction.RIGHT.value
+        self.score[idx] = 0
+        self.done[idx] = False
+
+        self.place_food(idx)
+
+    def place_food(self, idx: np.ndarray) -> None:
+        """Places food uniformly on a free cell; a board without free cells is done"""
+        keys = self.rng.random((idx.size, self.cells))
+        keys[self.grid[idx]] = -1
+        cell = keys.argmax(axis=1)
+
+        full = keys[np.arange(idx.size), cell] < 0
+        self.food[idx] = cell
+        self.done[idx[full]] = True
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advances every board that is still playing by one move.
+        actions: (N,) Direction values, 0 keeps the current direction
+
+        Returns (reward, done, score), rewarding 10 for food and -10 for dying.
+        Finished boards are left untouched until reset.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        reward = np.zeros(self.n, dtype=np.int64)
+
+        idx = np.flatnonzero(~self.done)
+        if not idx.size:
+            return reward, self.done.copy(), self.score.copy()
+
+        action = actions[idx]
+        direction = np.where(action > 0, action, self.direction[idx])
+        self.direction[idx] = direction
+
+        x = self.head_x[idx] + DX[direction]
+        y = self.head_y[idx] + DY[direction]
+
+        # Keep going straight if head is eating neck
+        neck = self.body[idx, (self.ptr[idx] - 1) % self.cells]
+        reverse = (y * self.width + x) == neck
+        x[reverse] -= 2 * DX[direction[reverse]]
+        y[reverse] -= 2 * DY[direction[reverse]]
+
+        inside = (0 <= x) & (x < self.width) & (0 <= y) & (y < self.height)
+        cell = np.where(inside, y * self.width + x, 0)
+        dead = ~inside | self.grid[idx, cell]
+
+        self.done[idx[dead]] = True
+        reward[idx[dead]] = -10
+
+        alive = ~dead
+        idx, x, y, cell = idx[alive], x[alive], y[alive], cell[alive]
+
+        eaten = cell == self.food[idx]
+        grow, move = idx[eaten], idx[~eaten]
+
+        tail = self.body[move, (self.ptr[move] - self.length[move] + 1) % self.cells]
+        self.grid[move, tail] = False
+
+        self.ptr[idx] = (self.ptr[idx] + 1) % self.cells
+        self.body[idx, self.ptr[idx]] = cell
+        self.grid[idx, cell] = True
+        self.head_x[idx] = x
+        self.head_y[idx] = y
+
+        self.length[grow] += 1
+        self.score[grow] += 1
+        reward[grow] = 10
+        if grow.size:
+            self.place_food(grow)
+
+        return reward, self.done.copy(), self.score.copy()
+
+    def snake(self, board: int) -> np.ndarray:
+        """Returns the body cells of a board ordered from head to tail"""
+        steps = np.arange(self.length[board])
+        return self.body[board, (self.ptr[board] - steps) % self.cells]
@@ -1,18 +1,25 @@
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
 from blessed import Terminal
 
 from config import settings
 from lib.exceptions import TerminalTooSmall
 
-from .base import Point, SnakeGame
+from .base import QUIT, Direction, Point, SnakeGame
 
 
 class SnakeGameCLI(SnakeGame):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
+    def __init__(self, width: int, height: int, seed: Optional[int] = None) -> None:
+        super().__init__(width, height, seed)
         self.speed = settings.Display.DELAY
         self.display = Terminal()
         self.tail = None
 
+        # Pending output of the current frame, see flush
+        self.buffer: List[str] = []
+        self.cells: Dict[Tuple[int, int], Callable[[str], str]] = {}
+
         self.color_food = self.display.on_red
         self.color_snake = self.display.on_green
 
@@ -21,9 +28,32 @@ class SnakeGameCLI(SnakeGame):
 
         self.initialize_display()
 
-    def get_event(self):
+    def start_input(self) -> None:
+        self.keys = {
+            self.display.KEY_UP: Direction.UP,
+            self.display.KEY_RIGHT: Direction.RIGHT,
+            self.display.KEY_DOWN: Direction.DOWN,
+            self.display.KEY_LEFT: Direction.LEFT,
+        }
+        self.reading = True
+        self.reader = threading.Thread(target=self.read_keys, daemon=True)
+        self.reader.start()
+
+    def stop_input(self) -> None:
+        if self.input_started:
+            self.reading = False
+            self.reader.join()
+        super().stop_input()
+
+    def read_keys(self) -> None:
+        """Input reader thread: stays in cbreak mode and queues every key press"""
         with self.display.cbreak():
-            return self.display.inkey(timeout=self.speed)
+            while self.reading:
+                key = self.display.inkey(timeout=0.05)
+                if key == "q":
+                    self.events.put(QUIT)
+                elif key.code in self.keys:
+                    self.events.put(self.keys[key.code])
 
     def init_sizes(self):
         h, w = self.display.height, self.display.width
@@ -37,9 +67,29 @@ class SnakeGameCLI(SnakeGame):
         self.init_sizes()
 
     def display_cell(self, pt: Point, color) -> None:
-        x, y = pt.x + self.w_offset, pt.y + self.h_offset
-        with self.display.location():
-            print(self.display.move_yx(y, x) + (color(" ")))
+        self.cells[pt.y + self.h_offset, pt.x + self.w_offset] = color
+
+    def flush(self) -> None:
+        """
+        Writes the frame to the terminal in a single write: the queued text first, then
+        the queued cells with one cursor move per run of same colored cells on a row.
+        """
+        frame, run, length = self.buffer, None, 0
+        for (y, x), color in sorted(self.cells.items()):
+            if run and y == run[0] and x == run[1] + length and color is run[2]:
+                length += 1
+                continue
+            if run:
+                frame.append(self.display.move_yx(*run[:2]) + run[2](" " * length))
+            run, length = (y, x, color), 1
+        if run:
+            frame.append(self.display.move_yx(*run[:2]) + run[2](" " * length))
+
+        if frame:
+            stream = self.display.stream
+            stream.write(self.display.save + "".join(frame) + self.display.restore)
+            stream.flush()
+        self.buffer, self.cells = [], {}
 
     def render_display(self) -> None:
         self.display_cell(self.food, self.color_food)
@@ -56,44 +106,44 @@ class SnakeGameCLI(SnakeGame):
             self.tail = self.snake[-1]
 
     def display_grid(self) -> None:
-        boundary = self.border_color(" ")
-
-        horizontal = (self.width + 1) * boundary
-        top = Point(self.h_offset - 1, self.w_offset)
-        bottom = Point(self.h_offset + self.height, self.w_offset)
-
-        vertical = range(self.h_offset - 1, self.h_offset + self.height + 1)
-        left = [Point(self.w_offset - 1, i) for i in vertical]
-        left += [Point(self.w_offset - 2, i) for i in vertical]
-        right = [Point(self.width + self.w_offset, i) for i in vertical]
-        right += [Point(self.width + self.w_offset + 1, i) for i in vertical]
-
-        with self.display.location():
-            print(self.display.move_yx(top.x, top.y) + horizontal)
-            for pt in left:
-                print(self.display.move_yx(pt.y, pt.x) + boundary)
-            for pt in right:
-                print(self.display.move_yx(pt.y, pt.x) + boundary)
-            print(self.display.move_yx(bottom.x, bottom.y) + horizontal)
+        top, bottom = self.h_offset - 1, self.h_offset + self.height
+        left, right = self.w_offset - 2, self.w_offset + self.width + 1
+
+        for x in range(left, right + 1):
+            self.cells[top, x] = self.cells[bottom, x] = self.border_color
+        for y in range(top, bottom + 1):
+            for x in (left, left + 1, right - 1, right):
+                self.cells[y, x] = self.border_color
 
     def new_game(self) -> None:
-        print(self.color_bg(self.display.clear))
+        self.buffer.append(self.color_bg(self.display.clear))
         self.display_grid()
+        self.tail = None
         super().new_game()
+        self.flush()
 
-    def refresh(self) -> None:
+    def display_score(self) -> None:
         score_text = "Score: %i" % self.score
         center = self.display.width // 2 - len(score_text)
-        with self.display.location():
-            print(self.display.move_yx(1, center) + (self.color_bg(score_text)))
-            self.render_display()
+        self.buffer.append(self.display.move_yx(1, center) + self.color_bg(score_text))
+
+    def refresh(self) -> None:
+        self.display_score()
+        self.render_display()
+        self.flush()
+
+    def render_frame(self, changes: Tuple[Set[Point], Set[Point]]) -> None:
+        added, removed = changes
+        self.display_score()
+        for pt in removed:
+            self.display_cell(pt, self.color_bg)
+        for pt in added:
+            self.display_cell(pt, self.color_snake)
+        self.display_cell(self.food, self.color_food)
+        self.flush()
 
     def exit(self) -> None:
+        self.stop_input()
         print(self.display.normal)
         print(self.display.clear)
         super().exit()
-
-    def handle_kill_switch(self) -> None:
-        with self.display.cbreak():
-            if self.display.inkey(timeout=0) == "q":
-                self.exit()
@@ -1,20 +1,27 @@
 import curses
 from curses import textpad
+from typing import Optional, Set, Tuple
 
 from config import settings
 from lib.exceptions import TerminalTooSmall
 
-from .base import Point, SnakeGame
+from .base import QUIT, Direction, Point, SnakeGame
 
 
 class SnakeGameCUI(SnakeGame):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
+    def __init__(self, width: int, height: int, seed: Optional[int] = None) -> None:
+        super().__init__(width, height, seed)
         self.speed = int(settings.Display.DELAY * 1000)
         self.tail = None
 
+        self.keys = {
+            curses.KEY_UP: Direction.UP,
+            curses.KEY_RIGHT: Direction.RIGHT,
+            curses.KEY_DOWN: Direction.DOWN,
+            curses.KEY_LEFT: Direction.LEFT,
+        }
+
         self.initialize_display()
-        self.get_event = self.display.getch
 
     def init_colors(self):
         curses.start_color()
@@ -74,13 +81,26 @@ class SnakeGameCUI(SnakeGame):
         )
         super().new_game()
 
-    def refresh(self) -> None:
+    def display_score(self) -> None:
         score_text = "Score: {}".format(self.score)
         h, w = 0, self.display.getmaxyx()[1] // 2 - len(score_text) // 2
         self.display.addstr(h, w, score_text)
+
+    def refresh(self) -> None:
+        self.display_score()
         self.render_display()
         self.display.refresh()
 
+    def render_frame(self, changes: Tuple[Set[Point], Set[Point]]) -> None:
+        added, removed = changes
+        self.display_score()
+        for pt in removed:
+            self.color_cell(pt, self.bg_color)
+        for pt in added:
+            self.color_cell(pt, self.snake_color)
+        self.color_cell(self.food, self.food_color)
+        self.display.refresh()
+
     def exit(self) -> None:
         self.display.keypad(False)
         curses.curs_set(True)
@@ -89,6 +109,20 @@ class SnakeGameCUI(SnakeGame):
         curses.endwin()
         super().exit()
 
+    def start_input(self) -> None:
+        pass
+
+    def pump_input(self, timeout: float = 0) -> None:
+        # curses is not thread safe, keys are read here: the first getch waits for the
+        # timeout, the following ones only drain keys that are already buffered
+        self.display.timeout(int(timeout * 1000))
+        while (key := self.display.getch()) != -1:
+            if key == ord("q"):
+                self.events.put(QUIT)
+            elif key in self.keys:
+                self.events.put(self.keys[key])
+            self.display.timeout(0)
+
     def handle_kill_switch(self) -> None:
-        if self.get_event() == ord("q"):
-            self.exit()
+        # Waiting for input here is what paces the game, unless another thread moves it
+        self.read_input(self.speed / 1000 if self.poll_input else 0)
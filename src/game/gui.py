@@ -1,15 +1,16 @@
+from typing import Iterable, List, Optional, Set, Tuple
+
 import pygame
 
 from config import settings
 from lib import color
 
-from .base import Point, SnakeGame
+from .base import QUIT, Direction, Point, SnakeGame
 
 
 class SnakeGameGUI(SnakeGame):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
-        self.get_event = pygame.event.get
+    def __init__(self, width: int, height: int, seed: Optional[int] = None) -> None:
+        super().__init__(width, height, seed)
         self.clock = pygame.time.Clock()
 
         self.framerate = settings.Display.FRAMERATE
@@ -20,6 +21,13 @@ class SnakeGameGUI(SnakeGame):
         self.food_color = settings.Color.FOOD
         self.tail = None
 
+        self.keys = {
+            pygame.K_UP: Direction.UP,
+            pygame.K_RIGHT: Direction.RIGHT,
+            pygame.K_DOWN: Direction.DOWN,
+            pygame.K_LEFT: Direction.LEFT,
+        }
+
         self.skin_color = color.lighten(self.snake_color)
         self.apple_color = color.darken(self.food_color)
         self.initialize_display()
@@ -29,51 +37,78 @@ class SnakeGameGUI(SnakeGame):
         pygame.display.set_caption("Snake")
         width, height = self.width * self.block, self.height * self.block
         self.display = pygame.display.set_mode((width, height))
-
-    def color_cell(self, pt: Point, color: pygame.Color) -> None:
-        x, y = pt.x * self.block, pt.y * self.block
-        cell = pygame.Rect(x, y, self.block, self.block)
-        pygame.draw.rect(self.display, color, cell)
-
-    def color_border(self, pt: Point, color: pygame.Color) -> None:
-        x, y = pt.x * self.block, pt.y * self.block
-        cell = pygame.Rect(x, y, self.block, self.block)
-        pygame.draw.rect(self.display, color, cell, 2)
+        self.caption = None
+
+        # Cells are blitted from sprites drawn once, and only changed cells are pushed
+        self.snake_sprite = self.make_sprite(self.snake_color, self.skin_color)
+        self.food_sprite = self.make_sprite(self.food_color, self.apple_color)
+        self.bg_sprite = self.make_sprite(self.bg_color)
+        self.dirty: List[pygame.Rect] = []
+
+    def make_sprite(
+        self, color: pygame.Color, border: Optional[pygame.Color] = None
+    ) -> pygame.Surface:
+        sprite = pygame.Surface((self.block, self.block)).convert()
+        sprite.fill(color)
+        if border:
+            pygame.draw.rect(sprite, border, sprite.get_rect(), 2)
+        return sprite
+
+    def draw_cells(self, sprite: pygame.Surface, pts: Iterable[Point]) -> None:
+        cells = [(sprite, (pt.x * self.block, pt.y * self.block)) for pt in pts]
+        self.dirty += self.display.blits(cells)
 
     def render_display(self) -> None:
-        self.color_cell(self.food, self.food_color)
-        self.color_border(self.food, self.apple_color)
+        self.draw_cells(self.food_sprite, [self.food])
 
         if self.tail:
-            self.color_cell(self.head, self.snake_color)
-            self.color_border(self.head, self.skin_color)
+            self.draw_cells(self.snake_sprite, [self.head])
         else:
-            for pt in self.snake:
-                self.color_cell(pt, self.snake_color)
-                self.color_border(pt, self.skin_color)
+            self.draw_cells(self.snake_sprite, self.snake)
             self.tail = self.snake[-1]
 
         if self.tail != self.snake[-1]:
-            self.color_cell(self.tail, self.bg_color)
+            self.draw_cells(self.bg_sprite, [self.tail])
             self.tail = self.snake[-1]
 
     def new_game(self) -> None:
         self.display.fill(self.bg_color)
+        self.dirty = [self.display.get_rect()]
+        self.tail = None
         super().new_game()
 
+    def update_caption(self) -> None:
+        caption = f"Snake - Score: {self.score}"
+        if caption != self.caption:
+            pygame.display.set_caption(caption)
+            self.caption = caption
+
     def refresh(self) -> None:
-        pygame.display.set_caption(f"Snake - Score: {self.score}")
+        self.update_caption()
         self.clock.tick(self.framerate)
         self.render_display()
-        pygame.display.flip()
+        pygame.display.update(self.dirty)
+        self.dirty = []
+
+    def render_frame(self, changes: Tuple[Set[Point], Set[Point]]) -> None:
+        added, removed = changes
+        self.update_caption()
+        self.draw_cells(self.bg_sprite, removed)
+        self.draw_cells(self.snake_sprite, added)
+        self.draw_cells(self.food_sprite, [self.food])
+        pygame.display.update(self.dirty)
+        self.dirty = []
 
     def exit(self) -> None:
         pygame.display.quit()
         pygame.quit()
         super().exit()
 
-    def handle_kill_switch(self) -> None:
-        super().handle_kill_switch()
-        for event in self.get_event():
+    def pump_input(self, timeout: float = 0) -> None:
+        # pygame events can only be read from the thread that owns the window
+        for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                self.exit()
+                self.events.put(QUIT)
+            elif event.type == pygame.KEYDOWN and event.key in self.keys:
+                self.events.put(self.keys[event.key])
+        super().pump_input(timeout)
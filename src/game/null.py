@@ -0,0 +1,27 @@
+from typing import Set, Tuple
+
+from lib.utilities import logger
+
+from .base import Point, SnakeGame
+
+
+class SnakeGameNull(SnakeGame):
+    """
+    Headless user interface: nothing is drawn, no input is polled and no frame delay
+    is applied, so games run at full speed in containers and batch jobs.
+    """
+
+    def game_completed(self) -> None:
+        # The board is full, end the game without waiting for <ENTER>
+        self.completed = True
+        if self.poll_input:
+            logger.info("Game completed with a score of %i", self.score)
+
+    def refresh(self) -> None:
+        pass
+
+    def render_frame(self, changes: Tuple[Set[Point], Set[Point]]) -> None:
+        pass
+
+    def handle_kill_switch(self) -> None:
+        pass
@@ -1,37 +1,49 @@
+from array import array
 from collections import namedtuple
 
 Point = namedtuple("Point", "x, y")
 
 
 class UnionFind:
-    def __init__(self):
-        self.group_id = 0
-        self.group = {}
-        self.id = {}
-
-    def union(self, a: int, b: int) -> None:
-        A, B = a in self.id, b in self.id
-        if A and B and self.id[a] != self.id[b]:
-            self._merge(a, b)
-        elif A or B:
-            self._add(a, b)
-        else:
-            self._create(a, b)
-
-    def _merge(self, a: int, b: int) -> None:
-        obs, targ = sorted((self.id[a], self.id[b]), key=lambda i: len(self.group[i]))
-        for node in self.group[obs]:
-            self.id[node] = targ
-        self.group[targ] |= self.group[obs]
-        del self.group[obs]
-
-    def _add(self, a: int, b: int) -> None:
-        a, b = (a, b) if a in self.id else (b, a)
-        targ = self.id[a]
-        self.group[targ] |= {b}
-        self.id[b] = targ
-
-    def _create(self, a: int, b: int) -> None:
-        self.group[self.group_id] = {a, b}
-        self.id[a] = self.id[b] = self.group_id
-        self.group_id += 1
+    """
+    Disjoint sets over the integers [0, size) with path compression and union by rank.
+    Elements join the structure the first time they are unioned and count tracks the
+    number of sets among them.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.parent = array("i", [-1]) * size
+        self.rank = bytearray(size)
+        self.count = 0
+
+    def __contains__(self, a: int) -> bool:
+        return self.parent[a] >= 0
+
+    def add(self, a: int) -> None:
+        if self.parent[a] < 0:
+            self.parent[a] = a
+            self.count += 1
+
+    def find(self, a: int) -> int:
+        parent = self.parent
+        root = a
+        while parent[root] != root:
+            root = parent[root]
+        while parent[a] != root:
+            parent[a], a = root, parent[a]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        self.add(a)
+        self.add(b)
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        self.count -= 1
+        return True
@@ -1,25 +1,82 @@
-import matplotlib.pyplot as plt
+import multiprocessing
+import queue
+import time
+from typing import Optional, Tuple
 
-plt.ion()
+Progress = Tuple[int, float, int]
 
 
-def plot(scores, mean_scores, record):
-    plt.figure("Progress Tracker", facecolor="black")
+class ProgressPlot:
+    """
+    Live training graph drawn by a separate process.
 
-    plt.clf()
+    update only queues the newest point, so training never waits on matplotlib. The
+    plotting process appends to its line data and redraws at most once per interval.
+    """
+
+    def __init__(self, interval: float = 1.0) -> None:
+        context = multiprocessing.get_context("spawn")
+        self.queue = context.Queue()
+        self.process = context.Process(
+            target=run_plot, args=(self.queue, interval), daemon=True
+        )
+        self.process.start()
+
+    def update(self, score: int, mean_score: float, record: int) -> None:
+        self.queue.put((score, mean_score, record))
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.process.join()
+
+
+def run_plot(updates: multiprocessing.Queue, interval: float) -> None:
+    """Plotting process entry point for ProgressPlot"""
+    import matplotlib.pyplot as plt
+
+    plt.ion()
     plt.style.use("dark_background")
-    plt.title(f"High Score: {record}")
+    figure, axes = plt.subplots(num="Progress Tracker", facecolor="black")
+    axes.set_ylabel("Score")
+    (score_line,) = axes.plot([], [])
+    (mean_line,) = axes.plot([], [])
+    score_text = axes.text(0, 0, "")
+    mean_text = axes.text(0, 0, "")
+    plt.show(block=False)
+
+    scores, mean_scores = [], []
+    record: Optional[int] = None
+    drawn, last_draw = 0, 0.0
+
+    while True:
+        try:
+            progress: Optional[Progress] = updates.get(timeout=interval)
+            if progress is None:
+                break
+            score, mean_score, record = progress
+            scores.append(score)
+            mean_scores.append(mean_score)
+        except queue.Empty:
+            pass
 
-    plt.xlabel(f"Number of Games ({len(scores)} Total)")
-    plt.ylabel("Score")
+        if drawn < len(scores) and time.monotonic() - last_draw >= interval:
+            games = range(len(scores))
+            score_line.set_data(games, scores)
+            mean_line.set_data(games, mean_scores)
+            score_text.set_position((len(scores) - 1, scores[-1]))
+            score_text.set_text(str(scores[-1]))
+            mean_text.set_position((len(mean_scores) - 1, mean_scores[-1]))
+            mean_text.set_text(str(mean_scores[-1]))
 
-    plt.plot(scores)
-    plt.plot(mean_scores)
+            axes.set_title(f"High Score: {record}")
+            axes.set_xlabel(f"Number of Games ({len(scores)} Total)")
+            axes.relim()
+            axes.autoscale_view(scaley=False)
+            axes.set_ylim(0, max(record, 1) * 1.05)
 
-    plt.ylim(ymin=0)
+            figure.canvas.draw_idle()
+            drawn, last_draw = len(scores), time.monotonic()
 
-    plt.text(len(scores) - 1, scores[-1], str(scores[-1]))
-    plt.text(len(mean_scores) - 1, mean_scores[-1], str(mean_scores[-1]))
+        figure.canvas.flush_events()
 
-    plt.show()
-    plt.pause(0.1)
+    plt.close(figure)
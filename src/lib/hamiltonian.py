@@ -5,9 +5,9 @@ Idea: For any array of size (M by N) where either or both of M and N must be eve
 
           i.e. (3, 4) okay (4, 3) okay, (4, 4) okay, (3, 3) not okay
           
-      The array can be subdivided into sections <= 36 nodes.
+      The array can be subdivided into sections of at most max_size nodes.
       
-      A hamiltonian cycle can easily be calculated for each section. 
+      A hamiltonian cycle can be constructed directly for each section (a comb pattern). 
       
       Then take random adjacent edges (adjacent meaning different cycles but parallel and one unit distance apart)
       and swap the edges:
@@ -26,16 +26,18 @@ Idea: For any array of size (M by N) where either or both of M and N must be eve
      edges {((0, 1), (1, 1)), ((1, 1), (1, 0))} and {((0, 0), (0, 1)),((0, 0), (1,0))}
 """
 import collections
-import functools
 import random
-from typing import DefaultDict, Dict, List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 from lib.dsa import Point, UnionFind
 from lib.exceptions import NoCyclePossible
 from lib.utilities import logger
 
+Edge = Tuple[Tuple[int, int], Tuple[int, int]]
+
 
 class HamCycle:
     def __init__(
@@ -45,21 +47,50 @@ class HamCycle:
         max_size: int = 20,
         shuffle: bool = True,
         display: bool = False,
+        seed: Optional[int] = None,
+        workers: int = 1,
     ) -> None:
         """
         R, C: (Rows, Columns) in the array
-        max_size: The maximum subarray size allowed, recommended 6 <= max_size <= 40 because of sub-cycle calc. times
+        max_size: The maximum subarray size allowed, smaller sections make the full cycle look more random
         shuffle: Shuffles kernel windows before merging subcycles (if true makes fullcycle appear more random)
         display: If true plots the subdivided regions, subcycles and full cycles for the array
+        seed: Seeds the shuffles so the same cycle can be rebuilt
+        workers: Splits the array into strips solved by a pool of processes, ignored with display
         """
         if R % 2 and C % 2:
             raise NoCyclePossible(R, C)
 
         self.R, self.C = R, C
         self.max_size = max_size
+        self.shuffle = shuffle
+        self.random = random.Random(seed)
+
+        successors = None
+        if display and workers > 1:
+            logger.warning("Plots need a sequential build, ignoring workers")
+        elif len(strips := self.split_strips(workers)) > 1:
+            logger.debug("Solving %i strips with %i workers", len(strips), workers)
+            successors = self.parallel_connect(strips, workers)
+            if not self.is_cycle(successors):
+                logger.warning("Strips did not join into a cycle, rebuilding")
+                successors = None
+
+        if successors is None:
+            self.full_cycle = self.connect(display)
+            if display:
+                self.show_full_cycle()
+
+            logger.debug("Converting full_cycle into a successor table")
+            successors = self.get_successors()
+
+        self.set_successors(successors)
 
+        logger.debug("Hamiltonian Cycle Complete!")
+
+    def connect(self, display: bool = False) -> List[Edge]:
         logger.debug("Subdividing array")
-        self.subarrays = self.subdivide(R - 1, C - 1, max_size)
+        self.subarrays = self.subdivide(self.R - 1, self.C - 1, self.max_size)
         if display:
             self.show_subcycle_regions()
 
@@ -70,16 +101,147 @@ class HamCycle:
             self.show_subcycles()
 
         logger.debug("Combining subcycles into a full cycle")
-        self.full_cycle = self.kernel_connect(shuffle=shuffle)
-        if display:
-            self.show_full_cycle()
+        return self.kernel_connect(shuffle=self.shuffle)
+
+    def split_strips(self, count: int) -> List[Tuple[int, int]]:
+        """
+        Returns up to count [start, end) ranges, each an even number of rows wide. Odd rows
+        cannot always be solved by the sequential builder (e.g. 5 x 6), so when R is odd the
+        ranges are taken over the columns instead
+        """
+        lines = self.C if self.R % 2 else self.R
+        pairs = lines // 2
+        count = max(1, min(count, pairs))
+        bounds = [2 * (pairs * k // count) for k in range(count)] + [lines]
+        return list(zip(bounds, bounds[1:]))
+
+    def parallel_connect(
+        self, strips: List[Tuple[int, int]], workers: int
+    ) -> np.ndarray:
+        """
+        1. Solves each strip as its own full cycle in a process pool, on the transposed
+            array when the strips are ranges of columns
+        2. Joins neighbouring strips bottom-up with a single kernel swap each:
+            a horizontal edge on each side of the boundary is replaced by the two vertical
+            edges crossing it, the upper strip is reversed first if both edges point the
+            same way so the joined cycle keeps one direction
+        3. Returns the successor table of the joined cycle
+
+        The joins run in this process: each one is a vectorized search of a single row
+        boundary, cheaper than sending the strips back to the pool to be merged pairwise
+        """
+        transpose = bool(self.R % 2)
+        R, C = (self.C, self.R) if transpose else (self.R, self.C)
+        args = [
+            (end - start, C, self.max_size, self.shuffle, self.random.getrandbits(32))
+            for start, end in strips
+        ]
+        with ProcessPoolExecutor(workers) as pool:
+            cycles = list(pool.map(solve_strip, *zip(*args)))
+
+        # Strip node r * C + c is node (r + start) * C + c in the full array
+        successors = np.concatenate(
+            [cycle + start * C for (start, _), cycle in zip(strips, cycles)]
+        )
+
+        nodes = np.arange(R * C, dtype=np.int32)
+        for start, end in reversed(strips[:-1]):
+            u = (end - 1) * C + np.arange(C - 1)
+            l = u + C
+            upper = successors[u] == u + 1
+            lower = successors[l] == l + 1
+            windows = np.flatnonzero(
+                (upper | (successors[u + 1] == u)) & (lower | (successors[l + 1] == l))
+            )
+            j = self.random.choice(windows.tolist()) if self.shuffle else windows[0]
+            u, l = u[j], l[j]
+
+            if upper[j] == lower[j]:
+                lo, hi = start * C, end * C
+                successors[successors[lo:hi].copy()] = nodes[lo:hi]
+
+            if successors[u] == u + 1:
+                successors[u], successors[l + 1] = l, u + 1
+            else:
+                successors[u + 1], successors[l] = l + 1, u
+
+        if transpose:
+            # Node c * R + r of the transposed array is node r * C + c
+            r, c = np.divmod(np.arange(self.R * self.C), self.C)
+            c_next, r_next = np.divmod(successors[c * self.R + r], self.R)
+            successors = (r_next * self.C + c_next).astype(np.int32)
+        return successors
+
+    def is_cycle(self, successors: np.ndarray) -> bool:
+        """True if every step moves to a neighbouring node and node 0 loops through all nodes"""
+        nodes = np.arange(self.R * self.C)
+        if len(successors) != len(nodes):
+            return False
+
+        r, c = np.divmod(nodes, self.C)
+        r_next, c_next = np.divmod(successors, self.C)
+        if (abs(r - r_next) + abs(c - c_next) != 1).any():
+            return False
+
+        successor, node = successors.tolist(), 0
+        for _ in range(len(nodes) - 1):
+            node = successor[node]
+            if node == 0:
+                return False
+        return successor[node] == 0
+
+    @classmethod
+    def from_successors(
+        cls, R: int, C: int, successors: np.ndarray, order: Optional[np.ndarray] = None
+    ) -> "HamCycle":
+        """Rebuilds a cycle from its next_index array, and its order array if known"""
+        cycle = cls.__new__(cls)
+        cycle.R, cycle.C = R, C
+        cycle.set_successors(successors, order)
+        return cycle
+
+    def set_successors(
+        self, successors: np.ndarray, order: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Nodes are numbered r * C + c:
+            next_index[node]: the node that follows along the cycle
+            order[node]: the position of the node along the cycle, starting from node 0
+            cell_at[position]: the node found at a position (inverse of order)
+
+        order is found by walking the cycle when it is not given
+        """
+        self.cells = len(successors)
+        self.next_index = successors
 
-        logger.debug("Converting full_cycle into a Directed Graph")
-        self.graph = self.get_graph()
+        if order is None:
+            order, successor, node = [0] * self.cells, successors.tolist(), 0
+            for position in range(self.cells):
+                order[node] = position
+                node = successor[node]
+            order = np.array(order, dtype=np.int32)
 
-        logger.debug("Hamiltonian Cycle Complete!")
+        self.order = order
+        self.cell_at = np.empty(self.cells, dtype=np.int32)
+        self.cell_at[order] = np.arange(self.cells, dtype=np.int32)
+
+    def index(self, pt: Tuple[int, int]) -> int:
+        return pt[0] * self.C + pt[1]
+
+    def point(self, index: int) -> Point:
+        return Point(*divmod(int(index), self.C))
+
+    def successor(self, pt: Tuple[int, int]) -> Point:
+        return self.point(self.next_index[self.index(pt)])
+
+    def distance(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        """Number of steps from a to b when following the cycle"""
+        steps = self.order[self.index(b)] - self.order[self.index(a)]
+        return int(steps) % self.cells
 
     def show_full_cycle(self) -> None:
+        import matplotlib.pyplot as plt
+
         plt.figure("Full Cycle")
         for edge in self.full_cycle:
             a, b = edge
@@ -88,6 +250,8 @@ class HamCycle:
         plt.show()
 
     def show_subcycles(self) -> None:
+        import matplotlib.pyplot as plt
+
         plt.figure("Subcycles")
         for subcycle in self.subcycles:
             x = [p[1] for p in subcycle]
@@ -97,6 +261,8 @@ class HamCycle:
         plt.show()
 
     def show_subcycle_regions(self) -> None:
+        import matplotlib.pyplot as plt
+
         arr = [[0] * self.C for _ in range(self.R)]
         subs = self.subarrays[:]
         random.shuffle(subs)
@@ -108,21 +274,6 @@ class HamCycle:
         plt.title("Subdivisions of Array")
         plt.imshow(arr)
 
-    @functools.lru_cache(None)
-    def get_edges(self, rows: int, cols: int) -> DefaultDict[Point, List[Point]]:
-        """Returns an edge-list for 4-directionally connected nodes in an array of dimensions (R, C)"""
-        edges = collections.defaultdict(list)
-        for r in range(rows):
-            for c in range(cols):
-                node = Point(r, c)
-                if r:
-                    edges[node].append(Point(r - 1, c))
-                    edges[Point(r - 1, c)].append(node)
-                if c:
-                    edges[node].append(Point(r, c - 1))
-                    edges[Point(r, c - 1)].append(node)
-        return edges
-
     def subdivide(
         self, R: int, C: int, max_size: int
     ) -> List[Tuple[int, int, int, int]]:
@@ -158,8 +309,8 @@ class HamCycle:
 
     def ham_cycle(self, x1: int, y1: int, x2: int, y2: int) -> List[Point]:
         """
-        Finds the hamiltonian cycle for a rectangle of (height, width)
-        Returns the edge-list offset by (offset_y, offset_x)
+        Builds the hamiltonian cycle for a rectangle of (height, width) in O(height * width)
+        Returns the closed path offset by (offset_y, offset_x)
         """
 
         # Get the offset to translate coordinates back to original values
@@ -168,45 +319,49 @@ class HamCycle:
         # Normalize points to start at (0, 0) instead of (x1, y1)
         R = x2 - x1 + 1
         C = y2 - y1 + 1
-        N = R * C
-
-        # Find cycle from (0, 0) through all nodes and back to (0, 0)
-        start = Point(0, 0)
-
-        def dfs(
-            node: Point, visited: Set[Point], edges: DefaultDict[Point, List[Point]]
-        ) -> List[Optional[Point]]:
-            nonlocal N, start
-            if len(visited) == N and start in edges[node]:
-                return [start]
-            for neighbor in edges[node]:
-                if neighbor not in visited:
-                    v = visited.copy() | {neighbor}
-                    p = dfs(neighbor, v, edges)
-                    if p[-1]:
-                        return [neighbor] + p
-            return [None]
-
-        @functools.lru_cache(None)
-        def find_cycle(R: int, C: int) -> List[Point]:
-            # Build edge list
-            start = Point(0, 0)
-            edges = self.get_edges(R, C)
-            return [start] + dfs(start, {start}, edges)
+
+        # The comb needs an even number of rows, pick a random orientation if both fit
+        coin = self.random.random
+        transpose = bool(R % 2) or (self.shuffle and not C % 2 and coin() < 0.5)
+        flip_r = self.shuffle and coin() < 0.5
+        flip_c = self.shuffle and coin() < 0.5
 
         self.count += 1
         logger.debug("%i/%i", self.count, len(self.subarrays))
 
-        result = find_cycle(R, C)
+        rows, cols = (C, R) if transpose else (R, C)
+        result = []
+        for r, c in self.comb_cycle(rows, cols):
+            if transpose:
+                r, c = c, r
+            if flip_r:
+                r = R - 1 - r
+            if flip_c:
+                c = C - 1 - c
+            result.append(Point(r + x_off, c + y_off))
+        return result
+
+    @staticmethod
+    def comb_cycle(rows: int, cols: int) -> List[Tuple[int, int]]:
+        """
+        Returns a closed path from (0, 0) through every node of a (rows, cols) array with an even
+        number of rows: serpentine along the rows skipping column 0, then back up column 0
 
-        # Shift the path by X_offset and Y_offset
-        return [Point(x + x_off, y + y_off) for x, y in result]
+             _______
+            |  _____|
+            | |_____
+            |_______|
+        """
+        path = [(0, 0)]
+        for r in range(rows):
+            columns = range(1, cols) if r % 2 == 0 else range(cols - 1, 0, -1)
+            path.extend((r, c) for c in columns)
+        path.extend((r, 0) for r in range(rows - 1, -1, -1))
+        return path
 
-    def kernel_connect(
-        self, shuffle: bool = True
-    ) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    def kernel_connect(self, shuffle: bool = True) -> List[Edge]:
         """
-        1. Groups together subcycle edges in a union-find data structure.
+        1. Groups together subcycle edges (numbered by position) in a union-find data structure.
         2. Creates a kernel (2 by 2 square with two parallel connected edges)
             i. parallel edges are vertical
             ii. parallel edges are horizontal
@@ -222,68 +377,84 @@ class HamCycle:
            Hamiltonian Cycle.
         """
 
+        # Edges are numbered: horizontal ((i, j), (i, j + 1)) -> i * (C - 1) + j
+        #                     vertical ((i, j), (i + 1, j)) -> H + i * C + j
+        R, C = self.R, self.C
+        H = R * (C - 1)
+
+        def edge_id(a: Tuple[int, int], b: Tuple[int, int]) -> int:
+            (r1, c1), (r2, c2) = a, b
+            if r1 == r2:
+                return r1 * (C - 1) + min(c1, c2)
+            return H + min(r1, r2) * C + c1
+
+        def edge_points(edge: int) -> Edge:
+            if edge < H:
+                r, c = divmod(edge, C - 1)
+                return (r, c), (r, c + 1)
+            r, c = divmod(edge - H, C)
+            return (r, c), (r + 1, c)
+
         # 1. Add EDGES into a union-find data structure
-        uf = UnionFind()
+        uf = UnionFind(H + (R - 1) * C)
+        network = bytearray(H + (R - 1) * C)
         for subcycle in self.subcycles:
-            edges = list(zip(subcycle, subcycle[1:]))  # points to edges
-            for a, b in list(zip(edges, edges[1:])):
+            edges = [edge_id(a, b) for a, b in zip(subcycle, subcycle[1:])]
+            for a, b in zip(edges, edges[1:]):
                 # edges to network each node in uf is an EDGE not a point
-                a, b = tuple(sorted(a)), tuple(sorted(b))
                 uf.union(a, b)
-
-        # logger.debug(uf.group)
+                network[a] = network[b] = 1
 
         # 2-4. Create parallel and vertical kernels and shuffle
         kernels = []
-        for i in range(self.R - 1):
-            for j in range(self.C - 1):
-                v1, v2 = ((i, j), (i + 1, j)), ((i, j + 1), (i + 1, j + 1))
-                h1, h2 = ((i, j), (i, j + 1)), ((i + 1, j), (i + 1, j + 1))
-                if v1 in uf.id and v2 in uf.id and uf.id[v1] != uf.id[v2]:
+        for i in range(R - 1):
+            for j in range(C - 1):
+                v1, v2 = H + i * C + j, H + i * C + j + 1
+                h1, h2 = i * (C - 1) + j, (i + 1) * (C - 1) + j
+                if network[v1] and network[v2] and uf.find(v1) != uf.find(v2):
                     kernels.append((v1, v2, h1, h2))
-                elif h1 in uf.id and h2 in uf.id and uf.id[h1] != uf.id[h2]:
+                elif network[h1] and network[h2] and uf.find(h1) != uf.find(h2):
                     kernels.append((v1, v2, h1, h2))
         if shuffle:
-            random.shuffle(kernels)
+            self.random.shuffle(kernels)
 
         # 5. While union-find datastructure contains more than one network of edges
         #    pop from kernel, see if window contains two edges that are in different networks
         #    swap the connections to connect the two groups
-        removed = set()
-        while len(uf.group) > 1:
+        while uf.count > 1:
             v1, v2, h1, h2 = kernels.pop()
-            if v1 in uf.id and v2 in uf.id:
-                if uf.id[v1] != uf.id[v2]:
+            if network[v1] and network[v2]:
+                if uf.find(v1) != uf.find(v2):
                     uf.union(h1, h2)
                     uf.union(v1, h1)
                     uf.union(v2, h2)
-                    uf.id.pop(v1)
-                    uf.id.pop(v2)
-                    removed |= set([v1, v2])
-            elif h1 in uf.id and h2 in uf.id:
-                if uf.id[h1] != uf.id[h2]:
+                    network[v1] = network[v2] = 0
+                    network[h1] = network[h2] = 1
+            elif network[h1] and network[h2]:
+                if uf.find(h1) != uf.find(h2):
                     uf.union(v1, v2)
                     uf.union(v1, h1)
                     uf.union(v2, h2)
-                    uf.id.pop(h1)
-                    uf.id.pop(h2)
-                    removed |= set([h1, h2])
-        return [edge for edge in list(uf.id) if edge not in removed]
+                    network[h1] = network[h2] = 0
+                    network[v1] = network[v2] = 1
+        return [edge_points(edge) for edge, alive in enumerate(network) if alive]
 
-    def get_graph(self) -> Dict[Point, Point]:
+    def get_successors(self) -> np.ndarray:
         g = collections.defaultdict(list)
         for a, b in self.full_cycle:
+            a, b = self.index(a), self.index(b)
             g[a].append(b)
             g[b].append(a)
 
-        start = Point(0, 0)
-        finish = Point(*g[start][0])
-        dag = {finish: start}
-        while start != finish:
-            a, b = g[start]
+        successors = [0] * (self.R * self.C)
+        previous, node = g[0][0], 0
+        for _ in range(len(successors)):
+            a, b = g[node]
+            successors[node] = b if a == previous else a
+            previous, node = node, successors[node]
+        return np.array(successors, dtype=np.int32)
 
-            node = Point(*b) if dag.get(a, (-1, -1)) == start else Point(*a)
 
-            dag[start] = node
-            start = node
-        return dag
+def solve_strip(R: int, C: int, max_size: int, shuffle: bool, seed: int) -> np.ndarray:
+    """Process pool entry point for HamCycle.parallel_connect"""
+    return HamCycle(R, C, max_size=max_size, shuffle=shuffle, seed=seed).next_index
@@ -0,0 +1,60 @@
+import csv
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+FIELDS = ["game", "score", "mean_score", "record", "seconds"]
+
+
+class MetricsLog:
+    """
+    Appends one row per finished game to a .csv or .jsonl file (chosen by suffix).
+
+    Rows are handed to a writer thread through a queue, which flushes the file once per
+    interval instead of after every game.
+    """
+
+    def __init__(self, filepath: str, interval: float = 1.0) -> None:
+        self.path = Path(filepath)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.jsonl = self.path.suffix == ".jsonl"
+        self.interval = interval
+
+        self.queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def write(self, **row: Any) -> None:
+        self.queue.put(row)
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self) -> None:
+        new_file = not self.path.exists() or not self.path.stat().st_size
+        with self.path.open("a", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            if new_file and not self.jsonl:
+                writer.writeheader()
+
+            last_flush = time.monotonic()
+            while (row := self.get()) is not None:
+                if row and self.jsonl:
+                    file.write(json.dumps(row) + "\n")
+                elif row:
+                    writer.writerow(row)
+
+                if time.monotonic() - last_flush >= self.interval:
+                    file.flush()
+                    last_flush = time.monotonic()
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """Next row, an empty one when nothing arrived within the interval"""
+        try:
+            return self.queue.get(timeout=self.interval)
+        except queue.Empty:
+            return {}
@@ -0,0 +1,99 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from lib.exceptions import NoCyclePossible
+from lib.hamiltonian import HamCycle
+from lib.utilities import logger
+
+
+class CycleStore:
+    """
+    On-disk cache of Hamiltonian cycles stored as a (2, cells) array holding the successor
+    index and the position along the cycle of every cell, so loading needs no walk.
+
+    Cycles are keyed by (R, C, max_size, shuffle, seed, workers). A shuffled cycle
+    without a seed can never be rebuilt, so it is generated every time instead of being
+    cached.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, enabled: bool = True) -> None:
+        self.directory = directory or Path.cwd() / "cache/HamCycle"
+        self.enabled = enabled
+
+    def path(
+        self,
+        R: int,
+        C: int,
+        max_size: int,
+        shuffle: bool,
+        seed: Optional[int],
+        workers: int,
+    ) -> Path:
+        name = f"{max_size}-{int(shuffle)}-{seed}-{workers}.npy"
+        return self.directory / f"{R}x{C}" / name
+
+    def cacheable(self, shuffle: bool, seed: Optional[int]) -> bool:
+        return self.enabled and (seed is not None or not shuffle)
+
+    def load(
+        self,
+        R: int,
+        C: int,
+        max_size: int = 20,
+        shuffle: bool = True,
+        seed: Optional[int] = None,
+        workers: int = 1,
+    ) -> HamCycle:
+        configs = dict(max_size=max_size, shuffle=shuffle, seed=seed, workers=workers)
+        if not self.cacheable(shuffle, seed):
+            return HamCycle(R, C, **configs)
+
+        file = self.path(R, C, **configs)
+        if file.exists():
+            logger.debug("Loading cached Hamiltonian Cycle: %s", file)
+            cached = np.load(file, mmap_mode="r")
+            return HamCycle.from_successors(R, C, cached[0], cached[1])
+
+        cycle = HamCycle(R, C, **configs)
+        self.save(cycle, file)
+        return cycle
+
+    def save(self, cycle: HamCycle, file: Path) -> None:
+        """
+        Writes to a temporary file unique to this call first, so concurrent writers never
+        share a file and readers never see a partial cycle
+        """
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=file.parent, prefix=file.stem, suffix=".tmp", delete=False
+        ) as f:
+            np.save(f, np.stack([cycle.next_index, cycle.order]))
+        os.replace(f.name, file)
+        logger.debug("Cached Hamiltonian Cycle: %s", file)
+
+    def warm(
+        self,
+        sizes: Iterable[Tuple[int, int]],
+        max_size: int = 20,
+        shuffle: bool = True,
+        seed: Optional[int] = None,
+        workers: int = 1,
+    ) -> None:
+        if not self.cacheable(shuffle, seed):
+            logger.warning("Shuffled cycles without a seed cannot be cached")
+            return
+
+        for R, C in sizes:
+            try:
+                self.load(R, C, max_size, shuffle, seed, workers)
+                logger.info("Cached Hamiltonian Cycle for %iw %ih", R, C)
+            except NoCyclePossible as error:
+                logger.debug(error)
+            except Exception as error:
+                logger.warning(
+                    "Skipping Hamiltonian Cycle for %iw %ih: %r", R, C, error
+                )
@@ -1,3 +1,5 @@
+import itertools
+
 import players
 from config import settings
 from lib.utilities import debug, logger
@@ -12,6 +14,24 @@ def main() -> None:
     target_score = settings.TRAINER.TARGET_SCORE
     model = settings.Models.FILEPATH
 
+    if settings.Bench.RUN:
+        import bench
+
+        bench.run()
+        return
+
+    if settings.HamCycle.WARM:
+        from lib.store import CycleStore
+
+        low, high = settings.HamCycle.WARM_MIN, settings.HamCycle.WARM_MAX
+        CycleStore().warm(
+            itertools.product(range(low, high + 1), repeat=2),
+            max_size=settings.HamCycle.SUBSECTION_SIZE,
+            shuffle=settings.HamCycle.SHUFFLE,
+            seed=settings.HamCycle.SEED,
+            workers=settings.HamCycle.WORKERS,
+        )
+
     if settings.Player.HAM:
         player = players.hamiltonian.smart
     elif settings.Player.HUMAN:
@@ -19,8 +39,14 @@ def main() -> None:
     elif settings.Player.NEURAL:
         player = players.neural
 
+    if settings.Player.HUMAN and settings.UI.HEADLESS:
+        logger.error("Human players need an interactive user interface")
+        return
+
     if settings.Player.HAM or settings.Player.HUMAN:
-        if settings.UI.GUI:
+        if settings.UI.HEADLESS:
+            game = player.PlayerNull(width, height)
+        elif settings.UI.GUI:
             game = player.PlayerGUI(width, height)
         elif settings.UI.CUI:
             game = player.PlayerCUI(width, height)
@@ -30,7 +56,9 @@ def main() -> None:
         game.play()
 
     if settings.Player.NEURAL:
-        if settings.UI.GUI:
+        if settings.UI.HEADLESS:
+            agent = player.AgentNull(width, height, model)
+        elif settings.UI.GUI:
             agent = player.AgentGUI(width, height, model)
         elif settings.UI.CUI:
             agent = player.AgentCUI(width, height, model)
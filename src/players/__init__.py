@@ -1 +1,11 @@
-from . import hamiltonian, human, neural
+import importlib
+from types import ModuleType
+
+# Players are imported on first use so only the selected one loads its dependencies
+PLAYERS = ["hamiltonian", "human", "neural"]
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in PLAYERS:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,9 @@
+import threading
+import time
 from abc import abstractmethod
-from typing import Optional
+from typing import List, Optional
 
+from config import settings
 from game import Direction, SnakeGame
 from lib.utilities import logger
 
@@ -10,6 +13,8 @@ class PlayerBase:
         self.height = height
         self.width = width
         self.alive = True
+        self.decoupled = settings.Display.DECOUPLED
+        self.seed = settings.Game.SEED
 
         # Adjust based on user interface
         self.game = SnakeGame
@@ -21,12 +26,69 @@ class PlayerBase:
         """
         pass
 
+    def create_game(self) -> SnakeGame:
+        """Game of the player's user interface, seeded with self.seed"""
+        return self.game(self.width, self.height, self.seed)
+
     def play(self) -> None:
-        game = self.game(self.width, self.height)
+        game = self.create_game()
         game.new_game()
-        while self.alive:
-            direction = self.get_input(game)
-            self.alive = game.move(direction)
-            game.refresh()
+        if self.decoupled:
+            self.play_decoupled(game)
+        else:
+            while self.alive and not game.completed:
+                direction = self.get_input(game)
+                self.alive = game.move(direction)
+                game.refresh()
         logger.info("Final Score: %i", game.score)
         game.exit()
+
+    def play_decoupled(self, game: SnakeGame) -> None:
+        """
+        Moves on a simulation thread while this thread draws the latest state RENDER_FPS
+        times a second, skipping the moves made in between. Input is only polled here, and
+        a completed board is only prompted for and exited here once its last frame is drawn.
+        """
+        lock = threading.Lock()
+        errors = []
+        game.poll_input = False
+        simulation = threading.Thread(
+            target=self.run_simulation, args=(game, lock, errors), daemon=True
+        )
+        simulation.start()
+
+        frame = 1 / settings.Display.RENDER_FPS
+        while simulation.is_alive():
+            start = time.perf_counter()
+            game.handle_kill_switch()
+            with lock:
+                changes = game.frame_changes()
+            game.render_frame(changes)
+            simulation.join(max(frame - (time.perf_counter() - start), 0))
+
+        game.render_frame(game.frame_changes())
+        game.poll_input = True
+        if errors:
+            raise errors[0]
+        if game.completed:
+            game.game_completed()
+
+    def run_simulation(
+        self, game: SnakeGame, lock: threading.Lock, errors: List[BaseException]
+    ) -> None:
+        """
+        Plays at SIMULATION_SPEED moves per second, or as fast as possible when 0.
+        Errors are handed to the drawing thread to be raised there.
+        """
+        speed = settings.Display.SIMULATION_SPEED
+        interval = 1 / speed if speed else 0
+        deadline = time.perf_counter()
+        try:
+            while self.alive and not game.completed:
+                with lock:
+                    self.alive = game.move(self.get_input(game))
+                if interval:
+                    deadline += interval
+                    time.sleep(max(deadline - time.perf_counter(), 0))
+        except BaseException as error:
+            errors.append(error)
@@ -1,6 +1,6 @@
 from config import settings
-from game import Direction, SnakeGame, SnakeGameCLI, SnakeGameCUI, SnakeGameGUI
-from lib.hamiltonian import HamCycle
+from game import Direction, SnakeGame, SnakeGameNull
+from lib.store import CycleStore
 from players.base import PlayerBase
 
 
@@ -9,14 +9,18 @@ class PlayerHam(PlayerBase):
         super().__init__(width, height)
         self.max_size = settings.HamCycle.SUBSECTION_SIZE
         self.shuffle = settings.HamCycle.SHUFFLE
+        self.seed = settings.HamCycle.SEED
+        self.workers = settings.HamCycle.WORKERS
 
-        self.cycle = HamCycle(
+        store = CycleStore(enabled=settings.HamCycle.CACHE)
+        self.cycle = store.load(
             self.width,
             self.height,
             max_size=self.max_size,
             shuffle=self.shuffle,
+            seed=self.seed,
+            workers=self.workers,
         )
-        self.graph = self.cycle.graph
 
         self.directions = {
             (0, -1): Direction.UP,
@@ -27,23 +31,35 @@ class PlayerHam(PlayerBase):
 
     def get_input(self, game: SnakeGame) -> Direction:
         x, y = game.head
-        pt = self.graph[game.head]
+        pt = self.cycle.successor(game.head)
         return self.directions[pt.x - x, pt.y - y]
 
 
 class PlayerGUI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.gui import SnakeGameGUI
+
         self.game = SnakeGameGUI
 
 
 class PlayerCUI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cui import SnakeGameCUI
+
         self.game = SnakeGameCUI
 
 
 class PlayerCLI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cli import SnakeGameCLI
+
         self.game = SnakeGameCLI
+
+
+class PlayerNull(PlayerHam):
+    def __init__(self, width: int, height: int) -> None:
+        super().__init__(width, height)
+        self.game = SnakeGameNull
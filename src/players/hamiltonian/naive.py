@@ -2,7 +2,7 @@ from collections import defaultdict
 from functools import lru_cache
 from typing import DefaultDict, List, Optional, Set
 
-from game import Direction, Point, SnakeGame, SnakeGameCLI, SnakeGameCUI, SnakeGameGUI
+from game import Direction, Point, SnakeGame, SnakeGameNull
 from players.base import PlayerBase
 
 
@@ -76,16 +76,28 @@ class PlayerHam(PlayerBase):
 class PlayerGUI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.gui import SnakeGameGUI
+
         self.game = SnakeGameGUI
 
 
 class PlayerCUI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cui import SnakeGameCUI
+
         self.game = SnakeGameCUI
 
 
 class PlayerCLI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cli import SnakeGameCLI
+
         self.game = SnakeGameCLI
+
+
+class PlayerNull(PlayerHam):
+    def __init__(self, width: int, height: int) -> None:
+        super().__init__(width, height)
+        self.game = SnakeGameNull
@@ -1,10 +1,10 @@
-import collections
-import functools
-from typing import DefaultDict, Optional
+from itertools import islice
+from typing import Optional
 
 from config import settings
-from game import Direction, Point, SnakeGame, SnakeGameCLI, SnakeGameCUI, SnakeGameGUI
-from lib.hamiltonian import HamCycle
+from game import Direction, Point, SnakeGame, SnakeGameNull
+from lib.store import CycleStore
+from lib.utilities import logger
 from players.base import PlayerBase
 
 
@@ -14,18 +14,26 @@ class PlayerHam(PlayerBase):
         self.max_size = settings.HamCycle.SUBSECTION_SIZE
         self.shuffle = settings.HamCycle.SHUFFLE
         self.risk = settings.HamCycle.RISK
+        self.seed = settings.HamCycle.SEED
+        self.workers = settings.HamCycle.WORKERS
+        self.validate = settings.HamCycle.VALIDATE
 
-        self.cycle = HamCycle(
+        store = CycleStore(enabled=settings.HamCycle.CACHE)
+        self.cycle = store.load(
             self.width,
             self.height,
             max_size=self.max_size,
             shuffle=self.shuffle,
+            seed=self.seed,
+            workers=self.workers,
         )
-        self.graph = self.cycle.graph
 
-        self.food = None
         self.cells = width * height
-        self.cost = collections.defaultdict(lambda: self.cells)
+
+        # Sum of cycle distances between consecutive body cells, see track_body
+        self.body = None
+        self.spread = 0
+        self.head = self.tail = None
 
         self.directions = {
             (0, -1): Direction.UP,
@@ -35,18 +43,12 @@ class PlayerHam(PlayerBase):
         }
 
     def get_input(self, game: SnakeGame) -> Direction:
-        if not self.food:
-            self.food = game.food
-            self.cost = self.calc_cost(game.food)
-
-        if self.food == game.head:
-            self.food = game.food
-            self.cost = self.calc_cost(game.food)
+        self.track_body(game)
 
         if shortcut := self.shortcut_available(game):
             return shortcut
 
-        pt = self.graph[game.head]
+        pt = self.cycle.successor(game.head)
         return self.directions[pt.x - game.head.x, pt.y - game.head.y]
 
     def shortcut_available(self, game: SnakeGame) -> Optional[Direction]:
@@ -60,14 +62,65 @@ class PlayerHam(PlayerBase):
                 Point(x, y + 1),
                 Point(x - 1, y),
             )
-            if pos not in game.snake
+            if not game.is_occupied(pos)
         )
 
-        pt = min(moves, key=lambda i: self.cost[i])
-        if pt == self.graph[game.head] or self.is_safe(game, pt):
+        pt = min(moves, key=lambda i: self.calc_cost(game, i))
+        if pt == self.cycle.successor(game.head) or self.is_safe(game, pt):
             return self.directions[pt.x - x, pt.y - y]
 
+    def track_body(self, game: SnakeGame) -> None:
+        """
+        Updates the spread of the body along the cycle after the last move.
+        The body lies in cycle order from tail to head when the spread equals the
+        cycle distance from tail to head.
+        """
+        head, tail = game.head, game.snake[-1]
+
+        if game.snake is not self.body:
+            self.body = game.snake
+            self.spread = sum(
+                self.cycle.distance(b, a)
+                for a, b in zip(game.snake, islice(game.snake, 1, None))
+            )
+        else:
+            self.spread += self.cycle.distance(self.head, head)
+            if tail != self.tail:
+                self.spread -= self.cycle.distance(self.tail, tail)
+
+        self.head, self.tail = head, tail
+
     def is_safe(self, game: SnakeGame, new_head: Point) -> bool:
+        if not game.in_bounds(new_head):
+            return False
+        # Fall back to the simulation when the body is out of cycle order, or when the
+        # cycle itself runs into the body and the shortcut is the only way out
+        ordered = self.spread == self.cycle.distance(game.snake[-1], game.head)
+        if not ordered or game.is_occupied(self.cycle.successor(game.head)):
+            return self.simulate(game, new_head)
+
+        safe = self.in_order(game, new_head)
+        if safe and self.validate and not self.simulate(game, new_head):
+            logger.warning("Shortcut to %s failed the simulated safety check", new_head)
+            return False
+        return safe
+
+    def in_order(self, game: SnakeGame, new_head: Point) -> bool:
+        """
+        Constant time safety check for a body that lies in cycle order:
+            new_head must land between the head and the tail without skipping the food
+            the tail must stay ahead of the new head even if the snake keeps growing
+            after self.risk steps, matching the look ahead of simulate
+        """
+        ahead = self.cycle.distance(game.head, new_head)
+        if ahead >= self.cycle.distance(game.head, game.snake[-1]):
+            return False
+        if ahead > self.cycle.distance(game.head, game.food):
+            return False
+        room = self.cycle.distance(new_head, game.snake[-1])
+        return room + self.risk > len(game.snake) + 1
+
+    def simulate(self, game: SnakeGame, new_head: Point) -> bool:
         """
         Looks ahead snake.length + food_found steps:
             if snake never bites it's tail when following the ham path returns True
@@ -79,7 +132,7 @@ class PlayerHam(PlayerBase):
         body.appendleft(new_head)
         temp_body_set = set(body)
         for _ in range(len(body)):
-            body.appendleft(self.graph[body[0]])
+            body.appendleft(self.cycle.successor(body[0]))
             if food_found > 0:
                 temp_body_set.remove(body.pop())
             food_found -= 1
@@ -88,34 +141,38 @@ class PlayerHam(PlayerBase):
             temp_body_set.add(body[0])
         return True
 
-    @functools.lru_cache(None)
-    def calc_cost(self, food: Point) -> DefaultDict[Point, int]:
-        """Returns a map of Point -> steps to reach food if following the ham cycle"""
-
-        cost = collections.defaultdict(lambda: self.cells)
-        pt = self.graph[food]
-        cost[food] = 0
-        steps = 1
-        while steps <= self.cells:
-            cost[pt] = self.cells - steps
-            pt = self.graph[pt]
-            steps += 1
-        return cost
+    def calc_cost(self, game: SnakeGame, pt: Point) -> int:
+        """Returns the steps to reach food from pt if following the ham cycle"""
+        if not game.in_bounds(pt):
+            return self.cells
+        return self.cycle.distance(pt, game.food)
 
 
 class PlayerGUI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.gui import SnakeGameGUI
+
         self.game = SnakeGameGUI
 
 
 class PlayerCUI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cui import SnakeGameCUI
+
         self.game = SnakeGameCUI
 
 
 class PlayerCLI(PlayerHam):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cli import SnakeGameCLI
+
         self.game = SnakeGameCLI
+
+
+class PlayerNull(PlayerHam):
+    def __init__(self, width: int, height: int) -> None:
+        super().__init__(width, height)
+        self.game = SnakeGameNull
@@ -1,54 +1,44 @@
-import curses
 from typing import Optional
 
-import pygame
-
-from game import Direction, SnakeGameCLI, SnakeGameCUI, SnakeGameGUI
+from game import Direction, SnakeGame
 from players.base import PlayerBase
 
 
 class PlayerGUI(PlayerBase):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.gui import SnakeGameGUI
+
         self.game = SnakeGameGUI
+        # Keys are read on the game loop, which must stay in step with the display
+        self.decoupled = False
 
-    def get_input(self, game: SnakeGameGUI) -> Optional[Direction]:
-        for event in game.get_event():
-            if event.type == pygame.KEYDOWN:
-                return {
-                    pygame.K_UP: Direction.UP,
-                    pygame.K_RIGHT: Direction.RIGHT,
-                    pygame.K_DOWN: Direction.DOWN,
-                    pygame.K_LEFT: Direction.LEFT,
-                }.get(event.key)
+    def get_input(self, game: SnakeGame) -> Optional[Direction]:
+        return game.next_direction()
 
 
 class PlayerCUI(PlayerBase):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cui import SnakeGameCUI
+
         self.game = SnakeGameCUI
+        self.decoupled = False
 
-    def get_input(self, game: SnakeGameGUI) -> Optional[Direction]:
-        return {
-            curses.KEY_UP: Direction.UP,
-            curses.KEY_RIGHT: Direction.RIGHT,
-            curses.KEY_DOWN: Direction.DOWN,
-            curses.KEY_LEFT: Direction.LEFT,
-        }.get(game.get_event())
+    def get_input(self, game: SnakeGame) -> Optional[Direction]:
+        return game.next_direction()
 
 
 class PlayerCLI(PlayerBase):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height)
+        from game.cli import SnakeGameCLI
+
         self.height = height
         self.width = width
         self.alive = True
         self.game = SnakeGameCLI
+        self.decoupled = False
 
-    def get_input(self, game: SnakeGameGUI) -> Optional[Direction]:
-        return {
-            game.display.KEY_LEFT: Direction.LEFT,
-            game.display.KEY_RIGHT: Direction.RIGHT,
-            game.display.KEY_UP: Direction.UP,
-            game.display.KEY_DOWN: Direction.DOWN,
-        }.get(game.get_event().code)
+    def get_input(self, game: SnakeGame) -> Optional[Direction]:
+        return game.next_direction(game.speed)
@@ -1,3 +1,12 @@
-from .agent import Agent, AgentCLI, AgentCUI, AgentGUI
-from .state import GameStateBase, GameStateCLI, GameStateCUI, GameStateGUI
+from typing import Any
+
+from . import state
+from .agent import Agent, AgentCLI, AgentCUI, AgentGUI, AgentNull
+from .state import GameStateBase, GameStateNull
 from .trainer import Trainer
+
+
+def __getattr__(name: str) -> Any:
+    if name in state.INTERFACES:
+        return getattr(state, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
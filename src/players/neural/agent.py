@@ -1,16 +1,18 @@
 import random
-from collections import deque
 from typing import List, Optional
 
 import numpy as np
 import torch
 
 from config import settings
-from game import Direction, Point
+from game import Direction
 from players.base import PlayerBase
 
+from .features import game_features
+from .inference import get_policy
+from .memory import PrioritizedReplayMemory, ReplayMemory
 from .model import Linear_QNet, QTrainer
-from .state import GameStateBase, GameStateCLI, GameStateCUI, GameStateGUI
+from .state import GameStateBase, GameStateNull
 
 
 class _BaseAgent(PlayerBase):
@@ -27,29 +29,42 @@ class _BaseAgent(PlayerBase):
         self.MAX_MEMORY = settings.Models.MAX_MEMORY
         self.batch_size = settings.Models.BATCH_SIZE
         self.HIDDEN_LAYERS = settings.Models.HIDDEN_LAYERS
+        self.MEMORY_FILEPATH = settings.Models.MEMORY_FILEPATH
+        self.PRIORITIZED = settings.Models.PRIORITIZED
 
         self.model = self.get_model(model)
-        self.memory = deque(maxlen=self.MAX_MEMORY)
+        self.memory = self.get_memory()
         self.trainer = QTrainer(self.model, lr=self.LR, gamma=self.gamma)
 
     def get_model(self, model: Optional[str]) -> Linear_QNet:
         configs = (self.STATES, self.HIDDEN_LAYERS, self.ACTIONS)
         return Linear_QNet.load(model, *configs) if model else Linear_QNet(*configs)
 
+    def get_memory(self) -> ReplayMemory:
+        configs = (self.MAX_MEMORY, self.STATES, self.ACTIONS, self.MEMORY_FILEPATH)
+        if not self.PRIORITIZED:
+            return ReplayMemory(*configs)
+        return PrioritizedReplayMemory(
+            *configs,
+            alpha=settings.Models.PRIORITY_ALPHA,
+            beta=settings.Models.PRIORITY_BETA,
+        )
+
     def remember(self, state, action, reward, next_state, done) -> None:
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.append(state, action, reward, next_state, done)
+
+    def remember_batch(self, state, action, reward, next_state, done) -> None:
+        self.memory.extend(state, action, reward, next_state, done)
 
     def train_short_memory(self, state, action, reward, next_state, done) -> None:
         self.trainer.train_step(state, action, reward, next_state, done)
 
     def train_long_memory(self) -> None:
-        if len(self.memory) > self.batch_size:
-            mini_sample = random.sample(self.memory, self.batch_size)
-        else:
-            mini_sample = self.memory
-
-        states, actions, rewards, next_states, done = zip(*mini_sample)
-        self.trainer.train_step(states, actions, rewards, next_states, done)
+        indices = self.memory.indices(self.batch_size)
+        weights = self.memory.weights(indices)
+        batch = self.memory.batch(indices)
+        errors = self.trainer.train_step(*batch, weights=weights)
+        self.memory.update(indices, errors)
 
 
 class Agent(_BaseAgent):
@@ -57,6 +72,8 @@ class Agent(_BaseAgent):
         super().__init__(width, height, model)
         self.game = GameStateBase
         self.epsilon_breakpoint = settings.Models.EPSILON_BREAKPOINT
+        self.rng = np.random.default_rng()
+        self.policy = None
 
     def get_action(self, state) -> List[int]:
         # random moves: tradeoff exploration / exploitation
@@ -68,87 +85,79 @@ class Agent(_BaseAgent):
             final_move[move] = 1
         else:
             state0 = torch.tensor(state, dtype=torch.float)
-            prediction = self.model(state0)
+            with torch.inference_mode():
+                prediction = self.model(state0)
             move = torch.argmax(prediction).item()
             final_move[move] = 1
 
         return final_move
 
-    def get_state(self, game: GameStateBase):
-        head = game.snake[0]
-
-        food_up = game.food.y < game.head.y
-        food_right = game.food.x > game.head.x
-        food_down = game.food.y > game.head.y
-        food_left = game.food.x < game.head.x
-
-        move_up = game.direction == Direction.UP
-        move_right = game.direction == Direction.RIGHT
-        move_down = game.direction == Direction.DOWN
-        move_left = game.direction == Direction.LEFT
-
-        point_up = Point(head.x, head.y - 1)
-        point_right = Point(head.x + 1, head.y)
-        point_down = Point(head.x, head.y + 1)
-        point_left = Point(head.x - 1, head.y)
-
-        danger_straight = (
-            (move_up and game.is_collision(point_up))
-            or (move_right and game.is_collision(point_right))
-            or (move_down and game.is_collision(point_down))
-            or (move_left and game.is_collision(point_left))
-        )
-        danger_right = (
-            (move_up and game.is_collision(point_right))
-            or (move_right and game.is_collision(point_down))
-            or (move_down and game.is_collision(point_left))
-            or (move_left and game.is_collision(point_up))
-        )
-        danger_left = (
-            (move_up and game.is_collision(point_left))
-            or (move_right and game.is_collision(point_up))
-            or (move_down and game.is_collision(point_right))
-            or (move_left and game.is_collision(point_down))
-        )
+    def get_actions(self, states: np.ndarray) -> np.ndarray:
+        """Batched get_action: one forward pass picks the moves of every state"""
+        self.epsilon = self.epsilon_breakpoint - self.n_games
+        count = len(states)
+
+        with torch.inference_mode():
+            prediction = self.model(torch.as_tensor(states, dtype=torch.float))
+        moves = torch.argmax(prediction, dim=1).numpy()
+
+        explore = self.rng.integers(0, 201, count) < self.epsilon
+        moves[explore] = self.rng.integers(0, self.ACTIONS, explore.sum())
+
+        final_moves = np.zeros((count, self.ACTIONS), dtype=int)
+        final_moves[np.arange(count), moves] = 1
+        return final_moves
 
-        state = [
-            # Danger direction
-            danger_straight,
-            danger_right,
-            danger_left,
-            # Movement direction
-            move_up,
-            move_right,
-            move_down,
-            move_left,
-            # Food location
-            food_up,
-            food_right,
-            food_down,
-            food_left,
-        ]
-
-        return np.array(state, dtype=int)
+    def get_state(self, game: GameStateBase) -> np.ndarray:
+        return game_features(game)[0]
+
+    def get_greedy_action(self, state) -> List[int]:
+        final_move = [0, 0, 0]
+        final_move[self.policy(state)] = 1
+        return final_move
 
     def get_input(self, game: GameStateBase) -> Optional[Direction]:
         state = self.get_state(game)
-        action = self.get_action(state)
+        if self.policy:
+            action = self.get_greedy_action(state)
+        else:
+            action = self.get_action(state)
         return game.get_direction(action)
 
+    def play(self) -> None:
+        """Plays greedily with the trained model, no exploration"""
+        self.policy = get_policy(self.model, settings.Agent.INFERENCE)
+        try:
+            super().play()
+        finally:
+            self.policy = None
+
 
 class AgentGUI(Agent):
     def __init__(self, width: int, height: int, model: Optional[str] = None) -> None:
         super().__init__(width, height, model)
+        from .state import GameStateGUI
+
         self.game = GameStateGUI
 
 
 class AgentCUI(Agent):
     def __init__(self, width: int, height: int, model: Optional[str] = None) -> None:
         super().__init__(width, height, model)
+        from .state import GameStateCUI
+
         self.game = GameStateCUI
 
 
 class AgentCLI(Agent):
     def __init__(self, width: int, height: int, model: Optional[str] = None) -> None:
         super().__init__(width, height, model)
+        from .state import GameStateCLI
+
         self.game = GameStateCLI
+
+
+class AgentNull(Agent):
+    def __init__(self, width: int, height: int, model: Optional[str] = None) -> None:
+        super().__init__(width, height, model)
+        self.game = GameStateNull
@@ -0,0 +1,78 @@
+import numpy as np
+
+from game import Direction, SnakeGameBatch
+from game.batch import DX, DY
+
+from .state import GameStateBase
+
+FEATURES = 11
+# Offsets from a Direction value to keep straight, turn right and turn left
+TURNS = np.array([-1, 0, -2])
+DIRECTIONS = np.array([d.value for d in Direction])
+
+
+def extract_features(
+    head_x: np.ndarray,
+    head_y: np.ndarray,
+    direction: np.ndarray,
+    food_x: np.ndarray,
+    food_y: np.ndarray,
+    grid: np.ndarray,
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """
+    Builds the (N, 11) state of N boards at once:
+        danger straight, right and left relative to the current direction,
+        one-hot current direction (up, right, down, left),
+        food up, right, down and left of the head.
+
+    direction holds Direction values and grid is the (N, width * height) occupancy of
+    the snake bodies, indexed by y * width + x.
+    """
+    n = len(direction)
+    state = np.empty((n, FEATURES), dtype=int)
+
+    # (N, 3) straight, right and left turns as Direction values
+    turns = (direction[:, None] + TURNS) % 4 + 1
+    x = head_x[:, None] + DX[turns]
+    y = head_y[:, None] + DY[turns]
+    inside = (0 <= x) & (x < width) & (0 <= y) & (y < height)
+    cell = np.where(inside, y * width + x, 0)
+    state[:, :3] = ~inside | (grid[np.arange(n)[:, None], cell] > 0)
+
+    state[:, 3:7] = direction[:, None] == DIRECTIONS
+
+    state[:, 7] = food_y < head_y
+    state[:, 8] = food_x > head_x
+    state[:, 9] = food_y > head_y
+    state[:, 10] = food_x < head_x
+    return state
+
+
+def game_features(game: GameStateBase) -> np.ndarray:
+    """Features of a single game as a (1, 11) array"""
+    return extract_features(
+        np.array([game.head.x]),
+        np.array([game.head.y]),
+        np.array([game.direction.value]),
+        np.array([game.food.x]),
+        np.array([game.food.y]),
+        np.frombuffer(game.grid, dtype=np.uint8)[None],
+        game.width,
+        game.height,
+    )
+
+
+def batch_features(batch: SnakeGameBatch) -> np.ndarray:
+    """Features of every board of a SnakeGameBatch"""
+    return extract_features(
+        batch.head_x,
+        batch.head_y,
+        batch.direction,
+        batch.food % batch.width,
+        batch.food // batch.width,
+        batch.grid,
+        batch.width,
+        batch.height,
+    )
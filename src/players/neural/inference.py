@@ -0,0 +1,67 @@
+from typing import Union
+
+import numpy as np
+import torch
+
+from .model import Linear_QNet
+
+
+class TorchPolicy:
+    """
+    Greedy Linear_QNet policy for playing: no autograd, no exploration and a single input
+    tensor reused for every decision. With script=True the model is TorchScript-traced.
+    """
+
+    def __init__(self, model: Linear_QNet, script: bool = False) -> None:
+        self.input = torch.zeros((1, model.inputs[0]), dtype=torch.float)
+        self.buffer = self.input.numpy()  # shares memory with self.input
+
+        model.eval()
+        self.model = model
+        if script:
+            with torch.inference_mode():
+                self.model = torch.jit.trace(model, self.input)
+
+    def __call__(self, state: np.ndarray) -> int:
+        """Index of the best move for state"""
+        self.buffer[0] = state
+        with torch.inference_mode():
+            return int(torch.argmax(self.model(self.input)))
+
+
+class NumpyPolicy:
+    """
+    Greedy Linear_QNet policy evaluated with NumPy: two small matmuls into preallocated
+    buffers, which skips the framework dispatch that dominates such a tiny network.
+    Weights are copied when the policy is built.
+    """
+
+    def __init__(self, model: Linear_QNet) -> None:
+        weights = {k: v.detach().numpy() for k, v in model.state_dict().items()}
+        self.weight_in = np.ascontiguousarray(weights["layer_in.weight"].T)
+        self.bias_in = weights["layer_in.bias"].copy()
+        self.weight_out = np.ascontiguousarray(weights["layer_out.weight"].T)
+        self.bias_out = weights["layer_out.bias"].copy()
+
+        self.input = np.zeros(model.inputs[0], dtype=np.float32)
+        self.hidden = np.zeros(model.inputs[1], dtype=np.float32)
+        self.output = np.zeros(model.inputs[2], dtype=np.float32)
+
+    def __call__(self, state: np.ndarray) -> int:
+        """Index of the best move for state"""
+        self.input[:] = state
+        np.dot(self.input, self.weight_in, out=self.hidden)
+        self.hidden += self.bias_in
+        np.maximum(self.hidden, 0, out=self.hidden)
+        np.dot(self.hidden, self.weight_out, out=self.output)
+        self.output += self.bias_out
+        return int(self.output.argmax())
+
+
+def get_policy(
+    model: Linear_QNet, backend: str = "numpy"
+) -> Union[NumpyPolicy, TorchPolicy]:
+    """Greedy policy for backend numpy, script (TorchScript) or torch"""
+    if backend == "numpy":
+        return NumpyPolicy(model)
+    return TorchPolicy(model, script=backend == "script")
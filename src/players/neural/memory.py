@@ -0,0 +1,194 @@
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+Batch = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+class SumTree:
+    """
+    Binary tree stored in a flat array where every node holds the sum of its children.
+    Leaves [0, capacity) hold priorities; updates and prefix-sum searches are O(log n)
+    and run for a whole batch of leaves at once.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.depth = max(capacity - 1, 0).bit_length()
+        self.leaves = 1 << self.depth
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        return self.tree[np.asarray(indices) + self.leaves]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        nodes = np.asarray(indices) + self.leaves
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Returns the leaf reached by each prefix sum in values"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            right = values > self.tree[left]
+            values -= np.where(right, self.tree[left], 0)
+            nodes = left + right
+        return np.minimum(nodes - self.leaves, self.capacity - 1)
+
+
+class ReplayMemory:
+    """
+    Ring buffer of transitions stored in preallocated typed arrays.
+    Arrays already have the dtypes QTrainer expects so sampled batches become tensors
+    without another copy. When filepath is given the arrays are memory-mapped .npy
+    files in that directory so the buffer can grow past RAM.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        states: int,
+        actions: int,
+        filepath: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.size = 0
+        self.position = 0
+
+        self.directory = None
+        if filepath:
+            self.directory = Path.cwd() / "models/ReplayMemory" / filepath
+
+        self.state = self.allocate("state", (capacity, states), np.float32)
+        self.action = self.allocate("action", (capacity, actions), np.int64)
+        self.reward = self.allocate("reward", (capacity,), np.float32)
+        self.next_state = self.allocate("next_state", (capacity, states), np.float32)
+        self.done = self.allocate("done", (capacity,), np.bool_)
+
+    def allocate(self, name: str, shape: Tuple[int, ...], dtype: type) -> np.ndarray:
+        if not self.directory:
+            return np.zeros(shape, dtype=dtype)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file = self.directory / f"{name}.npy"
+        return np.lib.format.open_memmap(file, mode="w+", dtype=dtype, shape=shape)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, state, action, reward, next_state, done) -> int:
+        """Stores a transition, overwriting the oldest one when full, and returns its slot"""
+        i = self.position
+        self.state[i] = state
+        self.action[i] = action
+        self.reward[i] = reward
+        self.next_state[i] = next_state
+        self.done[i] = done
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def extend(self, state, action, reward, next_state, done) -> np.ndarray:
+        """Stores a batch of transitions in one write per array and returns their slots"""
+        count = len(reward)
+        slots = (self.position + np.arange(count)) % self.capacity
+        self.state[slots] = state
+        self.action[slots] = action
+        self.reward[slots] = reward
+        self.next_state[slots] = next_state
+        self.done[slots] = done
+
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return slots
+
+    def indices(self, batch_size: int) -> np.ndarray:
+        """Uniform sample without replacement, or every stored slot if there are too few"""
+        if self.size <= batch_size:
+            return np.arange(self.size)
+        return self.rng.choice(self.size, batch_size, replace=False)
+
+    def weights(self, indices: np.ndarray) -> Optional[np.ndarray]:
+        """Importance-sampling weights for the sampled slots, None when sampling is uniform"""
+        return None
+
+    def update(self, indices: np.ndarray, errors: np.ndarray) -> None:
+        """Feeds back the TD errors of a trained batch"""
+        pass
+
+    def batch(self, indices: np.ndarray) -> Batch:
+        return (
+            self.state[indices],
+            self.action[indices],
+            self.reward[indices],
+            self.next_state[indices],
+            self.done[indices],
+        )
+
+    def sample(self, batch_size: int) -> Batch:
+        return self.batch(self.indices(batch_size))
+
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """
+    Samples transitions proportionally to (|TD error| + epsilon) ** alpha using a sum-tree
+    and corrects the bias with importance-sampling weights (N * P(i)) ** -beta.
+    New transitions get the highest priority seen so far so each is replayed at least once.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        states: int,
+        actions: int,
+        filepath: Optional[str] = None,
+        seed: Optional[int] = None,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        epsilon: float = 1e-5,
+    ) -> None:
+        super().__init__(capacity, states, actions, filepath, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.priorities = SumTree(capacity)
+
+    def append(self, state, action, reward, next_state, done) -> int:
+        i = super().append(state, action, reward, next_state, done)
+        self.priorities.update(np.array([i]), np.array([self.max_priority]))
+        return i
+
+    def extend(self, state, action, reward, next_state, done) -> np.ndarray:
+        slots = super().extend(state, action, reward, next_state, done)
+        self.priorities.update(slots, np.full(len(slots), self.max_priority))
+        return slots
+
+    def indices(self, batch_size: int) -> np.ndarray:
+        """Stratified sample: one prefix sum from each of batch_size equal segments"""
+        if self.size <= batch_size:
+            return np.arange(self.size)
+        segment = self.priorities.total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        return np.minimum(self.priorities.find(values), self.size - 1)
+
+    def weights(self, indices: np.ndarray) -> np.ndarray:
+        probabilities = self.priorities.get(indices) / self.priorities.total
+        weights = (self.size * probabilities) ** -self.beta
+        return (weights / weights.max()).astype(np.float32)
+
+    def update(self, indices: np.ndarray, errors: np.ndarray) -> None:
+        priorities = (np.abs(errors) + self.epsilon) ** self.alpha
+        self.priorities.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
@@ -1,11 +1,15 @@
+import copy
+import pickle
+import queue
+import threading
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import torch.optim as optim
-import torchinfo
 
 from lib.utilities import logger
 
@@ -16,12 +20,15 @@ class Linear_QNet(nn.Module):
         self.inputs = (input_size, hidden_size, output_size)
         self.layer_in = nn.Linear(self.inputs[0], self.inputs[1])
         self.layer_out = nn.Linear(self.inputs[1], self.inputs[2])
+        self.optimizer_state: Optional[Dict[str, Any]] = None
 
     def forward(self, x) -> nn.Linear:
         x = F.relu(self.layer_in(x))
         return self.layer_out(x)
 
     def show_summary(self):
+        import torchinfo
+
         logger.info("Showing Model Summary")
         torchinfo.summary(self)
 
@@ -30,10 +37,47 @@ class Linear_QNet(nn.Module):
         for k, v in self.state_dict().items():
             logger.info("%s\t%a", k, v)
 
-    def save(self, filepath: str) -> None:
+    def checkpoint(
+        self, optimizer: Optional[optim.Optimizer] = None, **metadata: Any
+    ) -> Dict[str, Any]:
+        """Copies of the weights and optimizer state, so training can go on while saving"""
+        return {
+            "inputs": self.inputs,
+            "model": {k: v.detach().clone() for k, v in self.state_dict().items()},
+            "optimizer": copy.deepcopy(optimizer.state_dict()) if optimizer else None,
+            "metadata": metadata,
+        }
+
+    def save(
+        self,
+        filepath: str,
+        optimizer: Optional[optim.Optimizer] = None,
+        writer: Optional["CheckpointWriter"] = None,
+        **metadata: Any,
+    ) -> None:
         file = Path.cwd() / "models/Linear_QNet" / filepath
-        file.parent.mkdir(parents=True, exist_ok=True)
-        torch.save(self, file)
+        checkpoint = self.checkpoint(optimizer, **metadata)
+        if writer:
+            writer.save(checkpoint, file)
+        else:
+            write_checkpoint(checkpoint, file)
+
+    @staticmethod
+    def read(file: Path) -> Dict[str, Any]:
+        """
+        Loads a checkpoint with its tensors memory-mapped from the file.
+        Models pickled whole by older versions are converted to a checkpoint.
+        """
+        try:
+            return torch.load(file, mmap=True, weights_only=True)
+        except pickle.UnpicklingError:
+            model = torch.load(file, weights_only=False)
+            return {
+                "inputs": model.inputs,
+                "model": model.state_dict(),
+                "optimizer": None,
+                "metadata": {},
+            }
 
     @staticmethod
     def load(
@@ -43,8 +87,12 @@ class Linear_QNet(nn.Module):
 
         if file.exists():
             logger.info("Loading the following model: %s", filepath)
-            model = torch.load(file)
+            checkpoint = Linear_QNet.read(file)
+            model = Linear_QNet(*checkpoint["inputs"])
+            model.load_state_dict(checkpoint["model"])
+            model.optimizer_state = checkpoint["optimizer"]
             model.eval()
+            logger.debug("Model metadata: %s", checkpoint["metadata"])
         else:
             logger.warning("The following model was not found: %s", filepath)
             logger.warning("Defaulting to untrained model instance")
@@ -53,6 +101,41 @@ class Linear_QNet(nn.Module):
         return model
 
 
+class CheckpointWriter:
+    """
+    Saves checkpoints from a background thread so the training loop never waits on disk.
+    Each file is written next to its target and renamed over it, so readers and crashes
+    never see a partial model.
+    """
+
+    def __init__(self) -> None:
+        self.queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def save(self, checkpoint: Dict[str, Any], file: Path) -> None:
+        self.queue.put((checkpoint, file))
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self) -> None:
+        while (item := self.queue.get()) is not None:
+            # A failed write (disk full, permissions) must not stop the later ones
+            try:
+                write_checkpoint(*item)
+            except Exception:
+                logger.exception("Could not save checkpoint %s", item[1])
+
+
+def write_checkpoint(checkpoint: Dict[str, Any], file: Path) -> None:
+    file.parent.mkdir(parents=True, exist_ok=True)
+    temp = file.with_name(file.name + ".tmp")
+    torch.save(checkpoint, temp)
+    temp.replace(file)
+
+
 class QTrainer:
     def __init__(self, model: nn.Module, lr: float, gamma: int) -> None:
         self.lr = lr
@@ -60,20 +143,22 @@ class QTrainer:
         self.model = model
 
         self.optimizer = optim.Adam(model.parameters(), lr=self.lr)
+        if getattr(model, "optimizer_state", None):
+            self.optimizer.load_state_dict(model.optimizer_state)
         self.criterion = nn.MSELoss()
 
-    def train_step(self, state, action, reward, next_state, done) -> None:
-        # Optimize Conversion
-        state = np.array(state)
-        action = np.array(action)
-        reward = np.array(reward)
-        next_state = np.array(next_state)
-
-        # (n, x)
-        state = torch.tensor(state, dtype=torch.float)
-        action = torch.tensor(action, dtype=torch.long)
-        reward = torch.tensor(reward, dtype=torch.float)
-        next_state = torch.tensor(next_state, dtype=torch.float)
+    def train_step(
+        self, state, action, reward, next_state, done, weights=None
+    ) -> np.ndarray:
+        """
+        Runs one optimizer step and returns the absolute TD error of each sample.
+        weights: optional importance-sampling weight per sample (prioritized replay)
+        """
+        # (n, x) - shares memory with arrays that already have the right dtype
+        state = torch.as_tensor(np.asarray(state), dtype=torch.float)
+        action = torch.as_tensor(np.asarray(action), dtype=torch.long)
+        reward = torch.as_tensor(np.asarray(reward), dtype=torch.float)
+        next_state = torch.as_tensor(np.asarray(next_state), dtype=torch.float)
 
         if len(state.shape) == 1:
             # (1, x)
@@ -87,21 +172,24 @@ class QTrainer:
         predicted = self.model(state)
 
         # 2: Q_new = r + y * max(next_predicted Q value) -> only do this if not done
-        # predicted.clone()
-        # predictions[argmax(action)] = Q_new
-        target = predicted.clone()
-        for idx in range(len(done)):
-            Q_new = reward[idx]
-            if not done[idx]:
-                Q_new = reward[idx] + self.gamma * torch.max(
-                    self.model(next_state[idx])
-                )
-
-            target[idx][torch.argmax(action[idx]).item()] = Q_new
+        # target = predicted with Q_new written at argmax(action) of each sample
+        done = torch.as_tensor(np.asarray(done), dtype=torch.bool)
+        Q_next = torch.max(self.model(next_state), dim=1).values
+        Q_new = torch.where(done, reward, reward + self.gamma * Q_next)
+
+        moves = torch.argmax(action, dim=1, keepdim=True)
+        target = predicted.scatter(1, moves, Q_new.unsqueeze(1))
 
         self.optimizer.zero_grad()
 
-        loss = self.criterion(target, predicted)
+        if weights is None:
+            loss = self.criterion(target, predicted)
+        else:
+            weights = torch.as_tensor(np.asarray(weights), dtype=torch.float)
+            loss = torch.mean(weights.unsqueeze(1) * (target - predicted) ** 2)
         loss.backward()
 
         self.optimizer.step()
+
+        errors = Q_new - predicted.gather(1, moves).squeeze(1)
+        return errors.detach().abs().numpy()
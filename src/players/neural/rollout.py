@@ -0,0 +1,188 @@
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game import SnakeGameBatch
+
+from .features import FEATURES, TURNS, batch_features
+
+Step = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+# Name, trailing shape and dtype of every array exchanged with the rollout workers
+BUFFERS = [
+    ("moves", (), np.int64),
+    ("state", (FEATURES,), np.int64),
+    ("next_state", (FEATURES,), np.int64),
+    ("reward", (), np.int64),
+    ("done", (), np.bool_),
+    ("score", (), np.int64),
+]
+
+
+class Environments:
+    """
+    K headless games stepped in lockstep with the rules of GameStateBase.play_step:
+    moves are relative (keep straight, turn right, turn left), food is worth 10, dying
+    or running out of frames costs 10.
+
+    Finished games are restarted straight away, step returns the state they ended in
+    and self.state already holds the first state of the new game.
+    """
+
+    def __init__(
+        self,
+        envs: int,
+        width: int,
+        height: int,
+        max_iteration: int,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.games = SnakeGameBatch(envs, width, height, seed)
+        self.frames = np.zeros(envs, dtype=np.int64)
+        self.max_iteration = max_iteration
+        self.state = batch_features(self.games)
+
+    def step(self, moves: np.ndarray) -> Step:
+        """moves: (K,) index of the chosen move in the DecisionMatrix"""
+        games = self.games
+        direction = (games.direction + TURNS[moves]) % 4 + 1
+
+        # GameStateBase counts the new head before the tail moves, so length + 1
+        length = games.length + 1
+        self.frames += 1
+        reward, done, score = games.step(direction)
+
+        # Running out of frames ends the step before the food is eaten
+        too_slow = ~done & (self.frames > self.max_iteration * length)
+        score[too_slow & (reward > 0)] -= 1
+        games.done |= too_slow
+        reward[too_slow] = -10
+        done |= too_slow
+
+        next_state = batch_features(games)
+        games.reset(done)
+        self.frames[done] = 0
+        self.state = batch_features(games)
+        return next_state, reward, done, score
+
+    def close(self) -> None:
+        pass
+
+
+class RolloutWorkers:
+    """
+    Same interface as Environments with the K games split across worker processes.
+
+    Moves and results go through shared-memory arrays, the pipes only carry the signal
+    to step so a lockstep round costs no pickling. Workers are spawned rather than forked
+    since the trainer already runs threads and holds torch by then.
+    """
+
+    def __init__(
+        self,
+        envs: int,
+        width: int,
+        height: int,
+        max_iteration: int,
+        workers: int,
+        seed: Optional[int] = None,
+    ) -> None:
+        workers = min(workers, envs)
+        self.memory: Dict[str, SharedMemory] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, shape, dtype in BUFFERS:
+            size = envs * int(np.prod(shape)) * np.dtype(dtype).itemsize
+            self.memory[name] = SharedMemory(create=True, size=size)
+            self.arrays[name] = np.ndarray(
+                (envs, *shape), dtype=dtype, buffer=self.memory[name].buf
+            )
+
+        context = multiprocessing.get_context("spawn")
+        names = {name: memory.name for name, memory in self.memory.items()}
+        bounds = np.linspace(0, envs, workers + 1, dtype=int)
+
+        self.pipes: List[Connection] = []
+        self.processes: List[multiprocessing.Process] = []
+        for i, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+            pipe, child = context.Pipe()
+            worker_seed = None if seed is None else seed + i
+            args = (child, names, envs, start, end, width, height, max_iteration)
+            process = context.Process(
+                target=run_worker, args=(*args, worker_seed), daemon=True
+            )
+            process.start()
+            # Only the worker keeps its end, so recv fails with EOFError if it dies
+            child.close()
+            self.pipes.append(pipe)
+            self.processes.append(process)
+
+        self.wait()
+        self.state = self.arrays["state"].copy()
+
+    def wait(self) -> None:
+        for pipe in self.pipes:
+            pipe.recv()
+
+    def step(self, moves: np.ndarray) -> Step:
+        self.arrays["moves"][:] = moves
+        for pipe in self.pipes:
+            pipe.send(True)
+        self.wait()
+
+        self.state = self.arrays["state"].copy()
+        return (
+            self.arrays["next_state"].copy(),
+            self.arrays["reward"].copy(),
+            self.arrays["done"].copy(),
+            self.arrays["score"].copy(),
+        )
+
+    def close(self) -> None:
+        for pipe in self.pipes:
+            pipe.send(False)
+        for process in self.processes:
+            process.join()
+        for memory in self.memory.values():
+            memory.close()
+            memory.unlink()
+
+
+def run_worker(
+    pipe: Connection,
+    names: Dict[str, str],
+    envs: int,
+    start: int,
+    end: int,
+    width: int,
+    height: int,
+    max_iteration: int,
+    seed: Optional[int],
+) -> None:
+    """Worker process entry point for RolloutWorkers, steps games [start, end)"""
+    memory = {name: SharedMemory(name=names[name]) for name, _, _ in BUFFERS}
+    arrays = {
+        name: np.ndarray((envs, *shape), dtype=dtype, buffer=memory[name].buf)[
+            start:end
+        ]
+        for name, shape, dtype in BUFFERS
+    }
+
+    games = Environments(end - start, width, height, max_iteration, seed)
+    arrays["state"][:] = games.state
+    pipe.send(True)
+
+    while pipe.recv():
+        next_state, reward, done, score = games.step(arrays["moves"])
+        arrays["next_state"][:] = next_state
+        arrays["reward"][:] = reward
+        arrays["done"][:] = done
+        arrays["score"][:] = score
+        arrays["state"][:] = games.state
+        pipe.send(True)
+
+    del arrays
+    for shared in memory.values():
+        shared.close()
@@ -1,12 +1,21 @@
-from typing import Iterable, Optional, Tuple
+from typing import Any, Iterable, Optional, Tuple
 
+import game
 from config import settings
-from game import Direction, SnakeGame, SnakeGameCLI, SnakeGameCUI, SnakeGameGUI
+from game import Direction, SnakeGame, SnakeGameNull
+
+# Game states drawn by a user interface, created on first use so a run only loads the
+# backend it plays on, see __getattr__
+INTERFACES = {
+    "GameStateCLI": "SnakeGameCLI",
+    "GameStateCUI": "SnakeGameCUI",
+    "GameStateGUI": "SnakeGameGUI",
+}
 
 
 class GameStateBase(SnakeGame):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
+    def __init__(self, width: int, height: int, seed: Optional[int] = None) -> None:
+        super().__init__(width, height, seed)
         self.max_iteration = settings.States.MAX_ITERATION
         self.steps = [
             Direction.UP,
@@ -44,16 +53,15 @@ class GameStateBase(SnakeGame):
             reward = -10
             return reward, game_over, self.score
 
+        # update_tail already counts the food in the score
         if self.update_tail():
-            self.score += 1
             reward = 10
 
         return reward, game_over, self.score
 
 
-class GameStateGUI(GameStateBase, SnakeGameGUI):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
+class GameStateDrawn(GameStateBase):
+    """Refreshes the user interface the game state is mixed with after every step"""
 
     def play_step(self, action: Iterable[int]) -> Tuple[int, bool, int]:
         reward, game_over, self.score = super().play_step(action)
@@ -61,21 +69,15 @@ class GameStateGUI(GameStateBase, SnakeGameGUI):
         return reward, game_over, self.score
 
 
-class GameStateCUI(GameStateBase, SnakeGameCUI):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
-
-    def play_step(self, action: Iterable[int]) -> Tuple[int, bool, int]:
-        reward, game_over, self.score = super().play_step(action)
-        self.refresh()
-        return reward, game_over, self.score
+class GameStateNull(GameStateBase, SnakeGameNull):
+    def __init__(self, width: int, height: int, seed: Optional[int] = None) -> None:
+        super().__init__(width, height, seed)
 
 
-class GameStateCLI(GameStateBase, SnakeGameCLI):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
-
-    def play_step(self, action: Iterable[int]) -> Tuple[int, bool, int]:
-        reward, game_over, self.score = super().play_step(action)
-        self.refresh()
-        return reward, game_over, self.score
+def __getattr__(name: str) -> Any:
+    if name in INTERFACES:
+        interface = getattr(game, INTERFACES[name])
+        state = type(name, (GameStateDrawn, interface), {"__module__": __name__})
+        globals()[name] = state
+        return state
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,15 @@
+import time
+
+import numpy as np
+
 from config import settings
-from lib import graph
+from lib.graph import ProgressPlot
+from lib.metrics import MetricsLog
 from lib.utilities import logger
 
 from .agent import Agent
+from .model import CheckpointWriter
+from .rollout import Environments, RolloutWorkers
 
 
 class Trainer:
@@ -11,12 +18,19 @@ class Trainer:
         self.width = agent.width
         self.height = agent.height
         self.target_score = target_score
-        self.state = agent.game(self.width, self.height)
+        self.state = agent.create_game()
 
         self.total_score = 0
         self.score, self.mean_score = 0, 0
         self.record, self.mean_record = 0, 0
-        self.plot_scores, self.plot_mean_scores = [], []
+        self.started = time.perf_counter()
+        self.writer = CheckpointWriter()
+
+        interval = settings.TRAINER.GRAPH_INTERVAL
+        self.graph = ProgressPlot(interval) if settings.TRAINER.SHOW_GRAPHS else None
+        self.metrics = None
+        if settings.TRAINER.METRICS_FILEPATH:
+            self.metrics = MetricsLog(settings.TRAINER.METRICS_FILEPATH, interval)
 
         self.size = "%iw%ih/" % (self.width, self.height)
         self.best = "%s/best/" % self.size
@@ -27,18 +41,31 @@ class Trainer:
         self.agent.n_games += 1
         self.agent.train_long_memory()
 
+    def game_finished(self) -> None:
+        self.update_stats()
+        self.save_best()
+        self.save_steadfast()
+        self.show_progress()
+
     def update_stats(self) -> None:
         self.total_score += self.score
         self.mean_score = round(self.total_score / self.agent.n_games, 2)
         self.record = max(self.record, self.score)
         self.mean_record = max(self.mean_record, self.score)
 
-        self.plot_scores.append(self.score)
-        self.plot_mean_scores.append(self.mean_score)
-
     def save_model(self, path: str, num: int) -> None:
         file_name = "%s/%i.bin" % (path, num)
-        self.agent.model.save(file_name)
+        self.agent.model.save(
+            file_name,
+            self.agent.trainer.optimizer,
+            self.writer,
+            width=self.width,
+            height=self.height,
+            hidden_layers=self.agent.HIDDEN_LAYERS,
+            games=self.agent.n_games,
+            score=self.score,
+            mean_score=self.mean_score,
+        )
 
     def save_best(self) -> None:
         if self.score >= self.record >= self.target_score:
@@ -51,9 +78,34 @@ class Trainer:
     def show_progress(self) -> None:
         message = "Game %i: Score %i | Record: %i"
         logger.debug(message, self.agent.n_games, self.score, self.record)
-        graph.plot(self.plot_scores, self.plot_mean_scores, self.record)
+        if self.graph:
+            self.graph.update(self.score, self.mean_score, self.record)
+        if self.metrics:
+            self.metrics.write(
+                game=self.agent.n_games,
+                score=self.score,
+                mean_score=self.mean_score,
+                record=self.record,
+                seconds=round(time.perf_counter() - self.started, 3),
+            )
+
+    def close(self) -> None:
+        self.writer.close()
+        if self.graph:
+            self.graph.close()
+        if self.metrics:
+            self.metrics.close()
 
     def train(self) -> None:
+        try:
+            if settings.TRAINER.ENVS > 1:
+                self.train_parallel(settings.TRAINER.ENVS, settings.TRAINER.WORKERS)
+            else:
+                self.train_sequential()
+        finally:
+            self.close()
+
+    def train_sequential(self) -> None:
         while True:
             # Get old state
             stateOld = self.agent.get_state(self.state)
@@ -70,8 +122,33 @@ class Trainer:
 
             if done:
                 self.remember()
-                self.update_stats()
-                self.save_best()
-                self.save_steadfast()
-                if settings.TRAINER.SHOW_GRAPHS:
-                    self.show_progress()
+                self.game_finished()
+
+    def train_parallel(self, envs: int, workers: int = 0) -> None:
+        """
+        Steps envs headless games in lockstep: one forward pass picks every move, all
+        transitions go into replay together and one short memory step trains on them.
+        With workers > 0 the games are stepped in that many processes.
+        """
+        configs = (envs, self.width, self.height, settings.States.MAX_ITERATION)
+        seed = self.agent.seed
+        if workers:
+            games = RolloutWorkers(*configs, workers, seed)
+        else:
+            games = Environments(*configs, seed)
+
+        try:
+            while True:
+                state = games.state
+                move = self.agent.get_actions(state)
+                next_state, reward, done, score = games.step(np.argmax(move, axis=1))
+
+                self.agent.remember_batch(state, move, reward, next_state, done)
+                self.agent.train_short_memory(state, move, reward, next_state, done)
+
+                for self.score in score[done].tolist():
+                    self.agent.n_games += 1
+                    self.agent.train_long_memory()
+                    self.game_finished()
+        finally:
+            games.close()